@@ -0,0 +1,31 @@
+"""Cover post URIs in the run_posts run_id index.
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Replace the plain run_id index with one that INCLUDEs uri so
+    # run-scoped post lookups can be served by an index-only scan
+    op.drop_index('ix_run_posts_run_id', table_name='run_posts')
+    op.create_index(
+        'ix_run_posts_run_id_inc',
+        'run_posts',
+        ['run_id'],
+        postgresql_include=['uri'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_run_posts_run_id_inc', table_name='run_posts')
+    op.create_index('ix_run_posts_run_id', 'run_posts', ['run_id'])
@@ -0,0 +1,34 @@
+"""Store runs.params_json as JSONB.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'runs',
+        'params_json',
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        postgresql_using='params_json::jsonb',
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'runs',
+        'params_json',
+        type_=postgresql.JSON(astext_type=sa.Text()),
+        postgresql_using='params_json::json',
+    )
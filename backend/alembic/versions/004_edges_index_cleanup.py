@@ -0,0 +1,27 @@
+"""Drop redundant edge indexes in favor of a (dst_uri, edge_type) composite.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # uq_edges_src_dst_type already serves src_uri prefix lookups
+    op.drop_index('ix_edges_src_uri', table_name='edges')
+    op.drop_index('ix_edges_dst_uri', table_name='edges')
+    op.create_index('ix_edges_dst_uri_type', 'edges', ['dst_uri', 'edge_type'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_edges_dst_uri_type', table_name='edges')
+    op.create_index('ix_edges_dst_uri', 'edges', ['dst_uri'])
+    op.create_index('ix_edges_src_uri', 'edges', ['src_uri'])
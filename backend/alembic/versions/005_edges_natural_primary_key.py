@@ -0,0 +1,32 @@
+"""Key edges by (src_uri, dst_uri, edge_type) and drop the surrogate id.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_constraint('edges_pkey', 'edges', type_='primary')
+    op.drop_constraint('uq_edges_src_dst_type', 'edges', type_='unique')
+    op.drop_column('edges', 'id')
+    op.create_primary_key('pk_edges', 'edges', ['src_uri', 'dst_uri', 'edge_type'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('pk_edges', 'edges', type_='primary')
+    op.execute('ALTER TABLE edges ADD COLUMN id BIGSERIAL')
+    op.create_primary_key('edges_pkey', 'edges', ['id'])
+    op.create_unique_constraint(
+        'uq_edges_src_dst_type',
+        'edges',
+        ['src_uri', 'dst_uri', 'edge_type'],
+    )
@@ -4,7 +4,8 @@ import time
 import uuid
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from ..db import get_session
@@ -15,10 +16,13 @@ from ..services import (
     ValidationError,
     create_run_and_ingest,
     get_run_graph,
+    stream_run_graph,
 )
 
 logger = logging.getLogger(__name__)
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 router = APIRouter(prefix="/runs", tags=["runs"])
 
 
@@ -75,10 +79,17 @@ def create_run(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+# Response validation of the returned GraphDTO is an isinstance check (pydantic
+# doesn't revalidate model instances), and response_model is what lets FastAPI
+# serialize it straight to JSON bytes in pydantic-core. Returning a dict or a
+# custom response instead falls back to jsonable_encoder. None-valued fields
+# (timeMin/timeMax) are part of the contract, so response_model_exclude_none
+# isn't set.
 @router.get("/{run_id}/graph", response_model=GraphDTO)
 def get_graph(
     run_id: uuid.UUID,
     max_nodes: Optional[int] = Query(None, description="Maximum number of nodes to return"),
+    accept: Optional[str] = Header(None),
     session: Session = Depends(get_session),
 ) -> GraphDTO:
     """
@@ -96,12 +107,20 @@ def get_graph(
     Query parameters:
     - maxNodes: optional limit on number of nodes (filters by engagement score)
     
+    Headers:
+    - Accept: application/x-ndjson streams one JSON object per line
+      ({"node": ...}, then {"edge": ...}, then {"stats": ...})
+    
     Returns:
         GraphDTO with nodes, edges, and stats
     """
     start_time = time.time()
     
     try:
+        if accept and NDJSON_MEDIA_TYPE in accept:
+            lines = stream_run_graph(session, run_id, max_nodes)
+            return StreamingResponse(lines, media_type=NDJSON_MEDIA_TYPE)
+        
         graph = get_run_graph(session, run_id, max_nodes)
         
         duration = time.time() - start_time
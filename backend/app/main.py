@@ -1,9 +1,13 @@
 """FastAPI application for Source Graph."""
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
+from bsky import ingest
+
 from .api import runs_router
 
 # Configure logging
@@ -14,11 +18,20 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close the Bluesky connections shared across runs on shutdown."""
+    yield
+    await run_in_threadpool(ingest.shutdown)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Source Graph API",
     description="Graph-based analysis of Bluesky conversations",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
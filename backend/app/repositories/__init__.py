@@ -3,9 +3,15 @@ from .runs_repository import (
     create_run,
     get_run,
     get_run_edges,
+    get_run_node_degrees,
     get_run_posts,
+    get_run_top_posts,
+    iter_run_node_edges,
+    iter_run_posts,
     link_run_edges,
     link_run_posts,
+    link_run_posts_many,
+    persist_run,
     upsert_edges,
     upsert_posts,
 )
@@ -15,8 +21,14 @@ __all__ = [
     "upsert_posts",
     "upsert_edges",
     "link_run_posts",
+    "link_run_posts_many",
     "link_run_edges",
+    "persist_run",
     "get_run",
     "get_run_posts",
+    "get_run_top_posts",
     "get_run_edges",
+    "get_run_node_degrees",
+    "iter_run_posts",
+    "iter_run_node_edges",
 ]
@@ -1,16 +1,51 @@
-"""Repository layer for database operations."""
+"""
+Repository layer for database operations.
+
+Read queries project native columns and return rows or ORM objects;
+JSON encoding happens once at the API edge. Don't wrap columns in
+to_json/to_jsonb/json_agg here, since that moves serialization cost onto
+Postgres.
+"""
+import io
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
-from sqlalchemy import and_, insert, select
+from sqlalchemy import (
+    CTE,
+    Insert,
+    Row,
+    Select,
+    Table,
+    bindparam,
+    column,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+    true,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+from uuid6 import uuid7
 
 from bsky.models import Edge as BskyEdge
 from bsky.models import Post as BskyPost
 
-from ..db.models import Edge, Post, Run, RunEdge, RunPost
+from ..db.models import Edge, Post, Run, RunEdge, RunPost, utcnow
+
+# Rows fetched per round-trip when streaming large result sets
+STREAM_BATCH_SIZE = 1000
+
+# Batches at least this large are bulk loaded on Postgres with COPY into a
+# temp table and merged with INSERT ... SELECT ... ON CONFLICT
+COPY_THRESHOLD = 500
 
 
 def create_run(
@@ -33,7 +68,7 @@ def create_run(
     Returns:
         UUID of created run
     """
-    run_id = uuid.uuid4()
+    run_id = uuid7()
     stmt = insert(Run).values(
         run_id=run_id,
         mode=mode,
@@ -60,9 +95,43 @@ def upsert_posts(session: Session, posts: list[BskyPost]) -> int:
     if not posts:
         return 0
     
-    # Convert Pydantic models to dicts
+    # A single INSERT ... ON CONFLICT DO UPDATE can't touch the same row
+    # twice, so duplicate URIs are collapsed (last one wins)
+    values = _dedupe(_post_values(posts), "uri")
+    
+    if session.bind.dialect.name == "postgresql" and len(values) >= COPY_THRESHOLD:
+        _copy_insert(
+            session,
+            Post.__table__,
+            values,
+            lambda rows: _on_conflict_update_post(
+                pg_insert(Post).from_select(list(values[0]), rows)
+            ),
+        )
+        return len(posts)
+    
+    # Postgres-specific upsert. Rows are passed as executemany parameters so
+    # the statement compiles once and the driver sends them in batches.
+    stmt = _on_conflict_update_post(pg_insert(Post))
+    session.execute(stmt, values)
+    return len(posts)
+
+
+def _post_values(posts: list[BskyPost]) -> list[dict]:
+    """
+    Convert normalized posts to row dicts for the posts table.
+    
+    Args:
+        posts: List of normalized post objects from ingestion
+        
+    Returns:
+        Row dicts keyed by column name
+    """
+    # Plain attribute reads; building nested dicts first (model_dump) measured
+    # ~3x slower for this conversion
     values = []
     for post in posts:
+        metrics = post.metrics
         values.append({
             "uri": post.uri,
             "cid": post.cid,
@@ -70,33 +139,146 @@ def upsert_posts(session: Session, posts: list[BskyPost]) -> int:
             "author_handle": post.author_handle,
             "created_at": post.created_at,
             "text": post.text,
-            "like_count": post.metrics.like_count,
-            "repost_count": post.metrics.repost_count,
-            "reply_count": post.metrics.reply_count,
-            "quote_count": post.metrics.quote_count,
+            "like_count": metrics.like_count,
+            "repost_count": metrics.repost_count,
+            "reply_count": metrics.reply_count,
+            "quote_count": metrics.quote_count,
         })
+    return values
+
+
+def _edge_values(edges: list[BskyEdge]) -> list[dict]:
+    """
+    Convert normalized edges to row dicts for the edges table.
+    
+    Args:
+        edges: List of normalized edge objects from ingestion
+        
+    Returns:
+        Row dicts keyed by column name
+    """
+    return [
+        {
+            "src_uri": edge.src_uri,
+            "dst_uri": edge.dst_uri,
+            "edge_type": edge.edge_type,
+            "created_at": edge.created_at,
+        }
+        for edge in edges
+    ]
+
+
+def _dedupe(values: list[dict], *keys: str) -> list[dict]:
+    """
+    Collapse rows that share the same key columns, keeping the last one
+    (in the position of the first), so batches don't carry redundant rows.
     
-    # Postgres-specific upsert
-    stmt = pg_insert(Post).values(values)
-    stmt = stmt.on_conflict_do_update(
+    Args:
+        values: Row dicts keyed by column name
+        keys: Columns that identify a row
+        
+    Returns:
+        Deduplicated row dicts
+    """
+    return list({tuple(row[key] for key in keys): row for row in values}.values())
+
+
+def _on_conflict_update_post(stmt: Insert) -> Insert:
+    """
+    Attach the posts upsert clause: on URI conflict, overwrite all fields.
+    Rows whose fields are all unchanged are skipped, so re-ingesting an
+    identical post doesn't write a new tuple version, index entries or WAL.
+    
+    Args:
+        stmt: Postgres INSERT into posts
+        
+    Returns:
+        INSERT ... ON CONFLICT (uri) DO UPDATE ... WHERE statement
+    """
+    updated = [
+        "cid",
+        "author_did",
+        "author_handle",
+        "created_at",
+        "text",
+        "like_count",
+        "repost_count",
+        "reply_count",
+        "quote_count",
+    ]
+    return stmt.on_conflict_do_update(
         index_elements=["uri"],
-        set_={
-            "cid": stmt.excluded.cid,
-            "author_did": stmt.excluded.author_did,
-            "author_handle": stmt.excluded.author_handle,
-            "created_at": stmt.excluded.created_at,
-            "text": stmt.excluded.text,
-            "like_count": stmt.excluded.like_count,
-            "repost_count": stmt.excluded.repost_count,
-            "reply_count": stmt.excluded.reply_count,
-            "quote_count": stmt.excluded.quote_count,
-        },
+        set_={name: stmt.excluded[name] for name in updated},
+        where=or_(*(
+            Post.__table__.c[name].is_distinct_from(stmt.excluded[name])
+            for name in updated
+        )),
     )
-    session.execute(stmt)
-    return len(posts)
 
 
-def upsert_edges(session: Session, edges: list[BskyEdge]) -> int:
+def _copy_insert(
+    session: Session,
+    target: Table,
+    values: list[dict],
+    build_insert: Callable[[Select], Insert],
+) -> int:
+    """
+    Bulk load rows with COPY into a temp staging table, then merge them
+    into the target with a single INSERT ... SELECT.
+    Postgres only.
+    
+    Args:
+        session: Database session
+        target: Table the rows belong to
+        values: Row dicts keyed by column name (same keys in every row)
+        build_insert: Builds the merging INSERT from a select over the
+            staged rows
+    
+    Returns:
+        Number of rows the merging INSERT wrote
+    """
+    columns = list(values[0])
+    column_list = ", ".join(columns)
+    staging = f"tmp_{target.name}"
+    
+    session.execute(text(
+        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+        f"SELECT {column_list} FROM {target.name} WITH NO DATA"
+    ))
+    
+    # Only None is written as an unquoted empty field, which COPY reads as
+    # NULL; every other value is quoted, so empty strings stay '' in every
+    # column, as on the executemany path
+    buf = io.StringIO()
+    buf.writelines(
+        ",".join([_csv_field(row[name]) for name in columns]) + "\n"
+        for row in values
+    )
+    buf.seek(0)
+    
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
+    finally:
+        cursor.close()
+    
+    staged = table(staging, *(column(name) for name in columns))
+    written = session.execute(build_insert(select(*staged.c))).rowcount
+    session.execute(text(f"DROP TABLE {staging}"))
+    return written
+
+
+def _csv_field(value: object) -> str:
+    """Format a value as a COPY CSV field: NULL unquoted, the rest quoted."""
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def upsert_edges(session: Session, edges: list[BskyEdge]) -> tuple[int, int]:
     """
     Upsert edges into the database.
     Does nothing on conflict (edges are immutable).
@@ -106,70 +288,36 @@ def upsert_edges(session: Session, edges: list[BskyEdge]) -> int:
         edges: List of normalized edge objects from ingestion
         
     Returns:
-        Number of edges processed
+        Number of edges received and number newly inserted
     """
     if not edges:
-        return 0
+        return 0, 0
     
-    # Check if we're using SQLite (for testing)
-    dialect_name = session.bind.dialect.name
-    
-    if dialect_name == 'sqlite':
-        # SQLite doesn't handle autoincrement with ON CONFLICT well
-        # Use a manual approach: check existence and insert only new edges
-        # Also deduplicate within the batch itself
-        seen = set()
-        unique_edges = []
-        for edge in edges:
-            key = (edge.src_uri, edge.dst_uri, edge.edge_type)
-            if key not in seen:
-                seen.add(key)
-                unique_edges.append(edge)
-        
-        inserted = 0
-        for edge in unique_edges:
-            # Check if edge already exists in database
-            stmt = select(Edge).where(
-                and_(
-                    Edge.src_uri == edge.src_uri,
-                    Edge.dst_uri == edge.dst_uri,
-                    Edge.edge_type == edge.edge_type,
-                )
-            )
-            existing = session.execute(stmt).scalar_one_or_none()
-            
-            if not existing:
-                # Insert new edge - let SQLAlchemy handle autoincrement
-                new_edge = Edge(
-                    src_uri=edge.src_uri,
-                    dst_uri=edge.dst_uri,
-                    edge_type=edge.edge_type,
-                    created_at=edge.created_at,
-                )
-                session.add(new_edge)
-                inserted += 1
-        
-        # Flush to ensure IDs are assigned
-        if inserted > 0:
-            session.flush()
-        return len(edges)
-    else:
-        # PostgreSQL: use native UPSERT
-        values = []
-        for edge in edges:
-            values.append({
-                "src_uri": edge.src_uri,
-                "dst_uri": edge.dst_uri,
-                "edge_type": edge.edge_type,
-                "created_at": edge.created_at,
-            })
-        
-        stmt = pg_insert(Edge).values(values)
-        stmt = stmt.on_conflict_do_nothing(
-            index_elements=["src_uri", "dst_uri", "edge_type"],
+    values = _dedupe(_edge_values(edges), "src_uri", "dst_uri", "edge_type")
+    
+    if session.bind.dialect.name == "postgresql" and len(values) >= COPY_THRESHOLD:
+        inserted = _copy_insert(
+            session,
+            Edge.__table__,
+            values,
+            lambda rows: pg_insert(Edge).from_select(
+                list(values[0]), rows
+            ).on_conflict_do_nothing(
+                index_elements=["src_uri", "dst_uri", "edge_type"],
+            ),
         )
-        session.execute(stmt)
-        return len(edges)
+        return len(edges), inserted
+    
+    # Edges are keyed by their natural primary key, so the same
+    # ON CONFLICT DO NOTHING statement works on Postgres and SQLite.
+    # The executemany is paged by insertmanyvalues, whose rowcount isn't
+    # the batch total on Postgres; RETURNING yields exactly the inserted
+    # rows (skipped conflicts return nothing) from every page
+    stmt = pg_insert(Edge).on_conflict_do_nothing(
+        index_elements=["src_uri", "dst_uri", "edge_type"],
+    ).returning(Edge.src_uri)
+    inserted = len(session.execute(stmt, values).all())
+    return len(edges), inserted
 
 
 def link_run_posts(session: Session, run_id: uuid.UUID, uris: list[str]) -> int:
@@ -184,15 +332,46 @@ def link_run_posts(session: Session, run_id: uuid.UUID, uris: list[str]) -> int:
     Returns:
         Number of links created
     """
-    if not uris:
+    return link_run_posts_many(session, [(run_id, uris)])
+
+
+def link_run_posts_many(
+    session: Session,
+    links: list[tuple[uuid.UUID, list[str]]],
+) -> int:
+    """
+    Link posts to several runs with a single INSERT.
+    
+    Args:
+        session: Database session
+        links: (run UUID, list of post URIs) pairs
+        
+    Returns:
+        Number of links created
+    """
+    values = _dedupe(
+        [{"run_id": run_id, "uri": uri} for run_id, uris in links for uri in uris],
+        "run_id",
+        "uri",
+    )
+    if not values:
         return 0
+    total = sum(len(uris) for _, uris in links)
     
-    values = [{"run_id": run_id, "uri": uri} for uri in uris]
+    if session.bind.dialect.name == "postgresql" and len(values) >= COPY_THRESHOLD:
+        _copy_insert(
+            session,
+            RunPost.__table__,
+            values,
+            lambda rows: pg_insert(RunPost).from_select(
+                list(values[0]), rows
+            ).on_conflict_do_nothing(),
+        )
+        return total
     
-    stmt = pg_insert(RunPost).values(values)
-    stmt = stmt.on_conflict_do_nothing()
-    session.execute(stmt)
-    return len(uris)
+    stmt = pg_insert(RunPost).on_conflict_do_nothing()
+    session.execute(stmt, values)
+    return total
 
 
 def link_run_edges(session: Session, run_id: uuid.UUID, edges: list[BskyEdge]) -> int:
@@ -210,22 +389,268 @@ def link_run_edges(session: Session, run_id: uuid.UUID, edges: list[BskyEdge]) -
     if not edges:
         return 0
     
-    values = []
-    for edge in edges:
-        values.append({
-            "run_id": run_id,
-            "src_uri": edge.src_uri,
-            "dst_uri": edge.dst_uri,
-            "edge_type": edge.edge_type,
-            "created_at": edge.created_at,
-        })
+    values = [
+        {"run_id": run_id, **row}
+        for row in _dedupe(_edge_values(edges), "src_uri", "dst_uri", "edge_type")
+    ]
     
-    stmt = pg_insert(RunEdge).values(values)
-    stmt = stmt.on_conflict_do_nothing()
-    session.execute(stmt)
+    if session.bind.dialect.name == "postgresql" and len(values) >= COPY_THRESHOLD:
+        _copy_insert(
+            session,
+            RunEdge.__table__,
+            values,
+            lambda rows: pg_insert(RunEdge).from_select(
+                list(values[0]), rows
+            ).on_conflict_do_nothing(),
+        )
+        return len(edges)
+    
+    stmt = pg_insert(RunEdge).on_conflict_do_nothing()
+    session.execute(stmt, values)
     return len(edges)
 
 
+def persist_run(
+    session: Session,
+    mode: str,
+    query: Optional[str],
+    seed_uri: Optional[str],
+    params_json: dict,
+    posts: list[BskyPost],
+    edges: list[BskyEdge],
+) -> uuid.UUID:
+    """
+    Create a run and persist its posts, edges and run links.
+    
+    On Postgres, runs below COPY_THRESHOLD are written with one statement
+    whose writes are data-modifying CTEs, so the whole persist is a single
+    round-trip. Larger runs and other dialects go through the individual
+    helpers (and their COPY path).
+    
+    Args:
+        session: Database session
+        mode: "query" or "seed"
+        query: Search query (for query mode)
+        seed_uri: Seed post URI (for seed mode)
+        params_json: Ingestion parameters as JSON
+        posts: List of normalized post objects from ingestion
+        edges: List of normalized edge objects from ingestion
+    
+    Returns:
+        UUID of created run
+    """
+    if (
+        session.bind.dialect.name != "postgresql"
+        or max(len(posts), len(edges)) >= COPY_THRESHOLD
+    ):
+        run_id = create_run(session, mode, query, seed_uri, params_json)
+        upsert_posts(session, posts)
+        upsert_edges(session, edges)
+        link_run_posts(session, run_id, [post.uri for post in posts])
+        link_run_edges(session, run_id, edges)
+        return run_id
+
+    # One INSERT can't touch the same post twice, so the last duplicate wins
+    post_values = _dedupe(_post_values(posts), "uri")
+    edge_values = _dedupe(_edge_values(edges), "src_uri", "dst_uri", "edge_type")
+    post_rows = _unnest_rows(
+        "post_rows",
+        Post.__table__,
+        post_values,
+        [
+            "uri", "cid", "author_did", "author_handle", "created_at", "text",
+            "like_count", "repost_count", "reply_count", "quote_count",
+        ],
+    )
+    edge_rows = _unnest_rows(
+        "edge_rows",
+        Edge.__table__,
+        edge_values,
+        ["src_uri", "dst_uri", "edge_type", "created_at"],
+    )
+    
+    # The run insert's RETURNING feeds the link inserts; every CTE runs to
+    # completion whether or not the final SELECT reads it. Python-side
+    # column defaults can't be evaluated inside a CTE, so created_at is
+    # passed explicitly.
+    created_at = utcnow()
+    new_run = insert(Run).values(
+        run_id=uuid7(),
+        mode=mode,
+        query=query,
+        seed_uri=seed_uri,
+        created_at=created_at,
+        params_json=params_json,
+    ).returning(Run.run_id).cte("new_run")
+    ins_posts = _on_conflict_update_post(
+        pg_insert(Post).from_select(list(post_rows.c.keys()), select(post_rows))
+    ).cte("ins_posts")
+    ins_edges = pg_insert(Edge).from_select(
+        list(edge_rows.c.keys()), select(edge_rows)
+    ).on_conflict_do_nothing(
+        index_elements=["src_uri", "dst_uri", "edge_type"],
+    ).cte("ins_edges")
+    link_posts = pg_insert(RunPost).from_select(
+        ["run_id", "uri", "created_at"],
+        select(
+            new_run.c.run_id,
+            post_rows.c.uri,
+            literal(created_at, RunPost.__table__.c.created_at.type),
+        ).join_from(new_run, post_rows, true()),
+    ).on_conflict_do_nothing().cte("link_posts")
+    link_edges = pg_insert(RunEdge).from_select(
+        ["run_id", *edge_rows.c.keys()],
+        select(new_run.c.run_id, *edge_rows.c).join_from(
+            new_run, edge_rows, true(),
+        ),
+    ).on_conflict_do_nothing().cte("link_edges")
+    
+    stmt = select(new_run.c.run_id).add_cte(
+        ins_posts, ins_edges, link_posts, link_edges,
+    )
+    return session.execute(stmt).scalar_one()
+
+
+def _unnest_rows(
+    name: str,
+    target: Table,
+    values: list[dict],
+    columns: list[str],
+) -> CTE:
+    """
+    Build a CTE over rows passed as one typed array parameter per column
+    and expanded with unnest(), so a batch of any size binds a fixed
+    number of parameters.
+    Postgres only.
+    
+    Args:
+        name: CTE name
+        target: Table the rows belong to (for column types)
+        values: Row dicts keyed by column name
+        columns: Columns to select, in order
+        
+    Returns:
+        CTE over the unnested rows
+    """
+    arrays = [
+        literal([row[name] for row in values], ARRAY(target.c[name].type))
+        for name in columns
+    ]
+    rows = func.unnest(*arrays).table_valued(*columns).render_derived()
+    return select(*rows.c).cte(name)
+
+
+def _select_degrees(edges: CTE) -> Select:
+    """
+    Build a select of (uri, in_degree, out_degree) aggregated over edges.
+    
+    Args:
+        edges: CTE with src_uri and dst_uri columns
+        
+    Returns:
+        Select statement grouped by URI
+    """
+    endpoints = union_all(
+        select(
+            edges.c.dst_uri.label("uri"),
+            literal_column("1").label("in_degree"),
+            literal_column("0").label("out_degree"),
+        ),
+        select(
+            edges.c.src_uri.label("uri"),
+            literal_column("0").label("in_degree"),
+            literal_column("1").label("out_degree"),
+        ),
+    ).subquery()
+    
+    return select(
+        endpoints.c.uri,
+        func.sum(endpoints.c.in_degree).label("in_degree"),
+        func.sum(endpoints.c.out_degree).label("out_degree"),
+    ).group_by(endpoints.c.uri)
+
+
+# Hot read statements are built once with a named run_id parameter. The
+# statement objects (and their memoized cache keys) are reused on every
+# call, so each request goes straight to the compiled-statement cache.
+_RUN_URIS = select(RunPost.uri).where(RunPost.run_id == bindparam("run_id"))
+
+_GET_RUN = select(Run).where(Run.run_id == bindparam("run_id"))
+
+# Post columns read for graph nodes. Selecting plain columns returns Core
+# rows, so reads skip the ORM identity map and attribute instrumentation.
+_POST_COLUMNS = (
+    Post.uri,
+    Post.cid,
+    Post.author_did,
+    Post.author_handle,
+    Post.created_at,
+    Post.text,
+    Post.like_count,
+    Post.repost_count,
+    Post.reply_count,
+    Post.quote_count,
+)
+
+# The full post and edge reads go through a server-side cursor in
+# STREAM_BATCH_SIZE batches, so libpq never buffers the whole result next
+# to the rows being materialized from it
+_GET_RUN_POSTS = (
+    select(*_POST_COLUMNS)
+    .where(Post.uri.in_(_RUN_URIS))
+    .execution_options(yield_per=STREAM_BATCH_SIZE)
+)
+
+_GET_RUN_EDGES = (
+    select(
+        RunEdge.src_uri,
+        RunEdge.dst_uri,
+        RunEdge.edge_type,
+        RunEdge.created_at,
+    )
+    .where(RunEdge.run_id == bindparam("run_id"))
+    .execution_options(yield_per=STREAM_BATCH_SIZE)
+)
+
+
+def _build_get_run_top_posts() -> Select:
+    """
+    Build the top-N posts statement: a run's posts ranked by engagement
+    (ties broken by URI), limited to :limit, each with in/out degrees over
+    the run's edges that stay inside that top-N set.
+    """
+    score = Post.like_count + Post.repost_count + Post.reply_count + Post.quote_count
+    top_posts = (
+        select(*_POST_COLUMNS, score.label("score"))
+        .where(Post.uri.in_(_RUN_URIS))
+        .order_by(score.desc(), Post.uri)
+        .limit(bindparam("limit"))
+        .cte("top_posts")
+    )
+    top_uris = select(top_posts.c.uri)
+    node_edges = (
+        select(RunEdge.src_uri, RunEdge.dst_uri)
+        .where(RunEdge.run_id == bindparam("run_id"))
+        .where(RunEdge.src_uri.in_(top_uris))
+        .where(RunEdge.dst_uri.in_(top_uris))
+        .cte("node_edges")
+    )
+    degrees = _select_degrees(node_edges).subquery("degrees")
+    
+    return (
+        select(
+            *(top_posts.c[column.key] for column in _POST_COLUMNS),
+            func.coalesce(degrees.c.in_degree, 0).label("in_degree"),
+            func.coalesce(degrees.c.out_degree, 0).label("out_degree"),
+        )
+        .outerjoin_from(top_posts, degrees, degrees.c.uri == top_posts.c.uri)
+        .order_by(top_posts.c.score.desc(), top_posts.c.uri)
+    )
+
+
+_GET_RUN_TOP_POSTS = _build_get_run_top_posts()
+
+
 def get_run(session: Session, run_id: uuid.UUID) -> Optional[Run]:
     """
     Fetch a run by ID.
@@ -237,12 +662,11 @@ def get_run(session: Session, run_id: uuid.UUID) -> Optional[Run]:
     Returns:
         Run object or None if not found
     """
-    stmt = select(Run).where(Run.run_id == run_id)
-    result = session.execute(stmt)
+    result = session.execute(_GET_RUN, {"run_id": run_id})
     return result.scalar_one_or_none()
 
 
-def get_run_posts(session: Session, run_id: uuid.UUID) -> list[Post]:
+def get_run_posts(session: Session, run_id: uuid.UUID) -> list[Row]:
     """
     Fetch all posts linked to a run.
     
@@ -251,35 +675,155 @@ def get_run_posts(session: Session, run_id: uuid.UUID) -> list[Post]:
         run_id: Run UUID
         
     Returns:
-        List of Post objects
+        List of post rows (read-only, with the Post column attributes)
     """
-    stmt = (
-        select(Post)
-        .join(RunPost, Post.uri == RunPost.uri)
-        .where(RunPost.run_id == run_id)
-    )
-    result = session.execute(stmt)
-    return list(result.scalars().all())
+    # Semijoin on the run's URIs lets the planner hash the (index-only)
+    # run_posts scan instead of probing posts once per link row
+    result = session.execute(_GET_RUN_POSTS, {"run_id": run_id})
+    return list(result.all())
 
 
-def get_run_edges(session: Session, run_id: uuid.UUID) -> list[tuple[str, str, str, Optional[datetime]]]:
+def get_run_top_posts(session: Session, run_id: uuid.UUID, limit: int) -> list[Row]:
+    """
+    Fetch a run's top posts by total engagement with their degrees.
+    Ranking, the limit and the degree aggregation (over edges with both
+    endpoints in the returned set) all happen in one query.
+    
+    Args:
+        session: Database session
+        run_id: Run UUID
+        limit: Maximum number of posts to return
+        
+    Returns:
+        Post rows with in_degree and out_degree, ordered by engagement
+        descending, then URI
     """
-    Fetch all edges linked to a run.
+    result = session.execute(_GET_RUN_TOP_POSTS, {"run_id": run_id, "limit": limit})
+    return list(result.all())
+
+
+def get_run_edges(
+    session: Session,
+    run_id: uuid.UUID,
+    uris: Optional[list[str]] = None,
+) -> list[tuple[str, str, str, Optional[datetime]]]:
+    """
+    Fetch edges linked to a run.
     Returns tuples of (src_uri, dst_uri, edge_type, created_at).
     
     Args:
         session: Database session
         run_id: Run UUID
+        uris: Optional node set; when given, only edges with both
+            endpoints in it are returned (filtered in the database)
         
     Returns:
         List of edge tuples
     """
-    stmt = select(
-        RunEdge.src_uri,
-        RunEdge.dst_uri,
-        RunEdge.edge_type,
-        RunEdge.created_at,
-    ).where(RunEdge.run_id == run_id)
-    
-    result = session.execute(stmt)
+    if uris is None:
+        result = session.execute(_GET_RUN_EDGES, {"run_id": run_id})
+    else:
+        stmt = _select_run_node_edges(run_id, uris).add_columns(
+            RunEdge.edge_type,
+            RunEdge.created_at,
+        )
+        result = session.execute(stmt)
     return list(result.all())
+
+
+def get_run_node_degrees(
+    session: Session,
+    run_id: uuid.UUID,
+    uris: Optional[list[str]] = None,
+) -> dict[str, tuple[int, int]]:
+    """
+    Aggregate in/out degrees for a run's nodes in the database.
+    Only edges with both endpoints in the node set are counted.
+    
+    Args:
+        session: Database session
+        run_id: Run UUID
+        uris: Optional node set; defaults to all posts linked to the run
+        
+    Returns:
+        Dict mapping URI to (in_degree, out_degree); nodes without
+        edges are omitted
+    """
+    edges = _select_run_node_edges(run_id, uris).cte("node_edges")
+    result = session.execute(_select_degrees(edges))
+    return {uri: (int(in_deg), int(out_deg)) for uri, in_deg, out_deg in result}
+
+
+def iter_run_posts(
+    session: Session,
+    run_id: uuid.UUID,
+    uris: Optional[list[str]] = None,
+) -> Iterator[Row]:
+    """
+    Stream posts linked to a run in batches of STREAM_BATCH_SIZE.
+    
+    Args:
+        session: Database session
+        run_id: Run UUID
+        uris: Optional node set; defaults to all posts linked to the run
+        
+    Yields:
+        Post rows
+    """
+    if uris is None:
+        nodes = select(RunPost.uri).where(RunPost.run_id == run_id)
+    else:
+        nodes = uris
+    
+    stmt = (
+        select(*_POST_COLUMNS)
+        .where(Post.uri.in_(nodes))
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    yield from session.execute(stmt)
+
+
+def iter_run_node_edges(
+    session: Session,
+    run_id: uuid.UUID,
+    uris: Optional[list[str]] = None,
+) -> Iterator[tuple[str, str, str]]:
+    """
+    Stream a run's edges whose endpoints are both in the node set.
+    Yields tuples of (src_uri, dst_uri, edge_type).
+    
+    Args:
+        session: Database session
+        run_id: Run UUID
+        uris: Optional node set; defaults to all posts linked to the run
+        
+    Yields:
+        Edge tuples
+    """
+    stmt = _select_run_node_edges(run_id, uris).add_columns(RunEdge.edge_type)
+    stmt = stmt.execution_options(yield_per=STREAM_BATCH_SIZE)
+    yield from session.execute(stmt)
+
+
+def _select_run_node_edges(run_id: uuid.UUID, uris: Optional[list[str]]) -> Select:
+    """
+    Build a select of (src_uri, dst_uri) for a run's edges within a node set.
+    
+    Args:
+        run_id: Run UUID
+        uris: Node set, or None for all posts linked to the run
+        
+    Returns:
+        Select statement
+    """
+    if uris is None:
+        nodes = select(RunPost.uri).where(RunPost.run_id == run_id)
+    else:
+        nodes = uris
+    
+    return (
+        select(RunEdge.src_uri, RunEdge.dst_uri)
+        .where(RunEdge.run_id == run_id)
+        .where(RunEdge.src_uri.in_(nodes))
+        .where(RunEdge.dst_uri.in_(nodes))
+    )
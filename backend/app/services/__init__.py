@@ -5,11 +5,13 @@ from .runs_service import (
     ValidationError,
     create_run_and_ingest,
     get_run_graph,
+    stream_run_graph,
 )
 
 __all__ = [
     "create_run_and_ingest",
     "get_run_graph",
+    "stream_run_graph",
     "ValidationError",
     "IngestionError",
     "NotFoundError",
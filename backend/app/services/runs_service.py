@@ -1,9 +1,12 @@
 """Service layer for run orchestration and graph assembly."""
 import logging
 import uuid
+from collections import Counter
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Sequence, Union
 
+from pydantic import BaseModel
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
 from bsky.ingest import query_mode, seed_mode
@@ -15,6 +18,10 @@ from ..schemas import GraphDTO, GraphEdge, GraphNode, GraphStats, PostMetrics
 
 logger = logging.getLogger(__name__)
 
+# Graph nodes are built by attribute access, so read-path Core rows and
+# Post objects are interchangeable
+PostLike = Union[Row, Post]
+
 
 class ValidationError(Exception):
     """Raised when input validation fails."""
@@ -38,7 +45,11 @@ def create_run_and_ingest(session: Session, payload: dict) -> uuid.UUID:
     This is the main orchestration function that:
     1. Validates input
     2. Calls the appropriate ingestion function
-    3. Persists posts, edges, and run links in a single transaction
+    3. Persists the run, posts, edges, and run links in a single transaction
+    
+    Ingestion runs before any database work so a request doesn't hold a
+    pooled connection (and an open transaction) while waiting on the
+    Bluesky API.
     
     Args:
         session: Database session (transaction)
@@ -66,16 +77,7 @@ def create_run_and_ingest(session: Session, payload: dict) -> uuid.UUID:
     if mode == "seed" and not seed_uri:
         raise ValidationError("Seed mode requires 'seedUri' field.")
     
-    # Create run record first
-    run_id = repo.create_run(
-        session=session,
-        mode=mode,
-        query=query,
-        seed_uri=seed_uri,
-        params_json=params,
-    )
-    
-    logger.info(f"Created run {run_id} in {mode} mode")
+    logger.info(f"Starting ingestion in {mode} mode")
     
     # Execute ingestion
     try:
@@ -100,31 +102,33 @@ def create_run_and_ingest(session: Session, payload: dict) -> uuid.UUID:
             result = seed_mode(inputs=inputs, config=config)
         
         logger.info(
-            f"Ingestion complete for run {run_id}: "
+            f"Ingestion complete ({mode} mode): "
             f"{len(result.posts)} posts, {len(result.edges)} edges, "
             f"{result.total_requests} requests, {result.cache_hits} cache hits"
         )
     except Exception as e:
-        logger.error(f"Ingestion failed for run {run_id}: {e}")
+        logger.error(f"Ingestion failed ({mode} mode): {e}")
         raise IngestionError(f"Ingestion failed: {str(e)}") from e
     
     # Persist results
+    run_id = None
     try:
-        # Upsert posts and edges
-        posts_count = repo.upsert_posts(session, result.posts)
-        edges_count = repo.upsert_edges(session, result.edges)
-        
-        # Link posts and edges to run
-        uris = [post.uri for post in result.posts]
-        repo.link_run_posts(session, run_id, uris)
-        repo.link_run_edges(session, run_id, result.edges)
+        run_id = repo.persist_run(
+            session=session,
+            mode=mode,
+            query=query,
+            seed_uri=seed_uri,
+            params_json=params,
+            posts=result.posts,
+            edges=result.edges,
+        )
         
         # Commit transaction
         session.commit()
         
         logger.info(
             f"Persisted run {run_id}: "
-            f"{posts_count} posts, {edges_count} edges"
+            f"{len(result.posts)} posts, {len(result.edges)} edges"
         )
         
         return run_id
@@ -164,9 +168,17 @@ def get_run_graph(
     if not run:
         raise NotFoundError(f"Run {run_id} not found")
     
-    # Fetch posts and edges
-    posts = repo.get_run_posts(session, run_id)
-    edge_tuples = repo.get_run_edges(session, run_id)
+    # Fetch posts and edges. With a node limit, the ranking, the limit and
+    # the degrees are computed in the database and only the top N posts
+    # (and the edges between them) are loaded.
+    if max_nodes:
+        posts = repo.get_run_top_posts(session, run_id, max_nodes)
+        degrees = {post.uri: (post.in_degree, post.out_degree) for post in posts}
+        edge_tuples = repo.get_run_edges(session, run_id, list(degrees))
+    else:
+        posts = repo.get_run_posts(session, run_id)
+        degrees = repo.get_run_node_degrees(session, run_id)
+        edge_tuples = repo.get_run_edges(session, run_id)
     
     logger.info(
         f"Retrieved graph for run {run_id}: "
@@ -174,7 +186,12 @@ def get_run_graph(
     )
     
     # Build graph
-    graph = _build_graph(posts, edge_tuples, max_nodes)
+    graph = _build_graph(
+        posts,
+        edge_tuples,
+        degrees,
+        edges_prefiltered=bool(max_nodes),
+    )
     
     logger.info(
         f"Assembled graph for run {run_id}: "
@@ -185,88 +202,60 @@ def get_run_graph(
 
 
 def _build_graph(
-    posts: list[Post],
+    posts: Sequence[PostLike],
     edge_tuples: list[tuple[str, str, str, Optional[datetime]]],
-    max_nodes: Optional[int] = None,
+    degrees: Optional[dict[str, tuple[int, int]]] = None,
+    edges_prefiltered: bool = False,
 ) -> GraphDTO:
     """
     Build a graph DTO from posts and edges.
     
     This helper function:
-    1. Optionally filters to top N nodes by engagement score
-    2. Filters edges to only include nodes in the graph
-    3. Computes in/out degrees
-    4. Computes time range statistics
+    1. Filters edges to only include nodes in the graph
+    2. Computes in/out degrees (unless precomputed)
+    3. Computes time range statistics
+    
+    Node limits are applied in the database (see get_run_top_posts), so
+    posts is already the final node set.
     
     Args:
-        posts: List of Post objects
+        posts: Post rows (or Post objects)
         edge_tuples: List of (src_uri, dst_uri, edge_type, created_at)
-        max_nodes: Optional limit on number of nodes
+        degrees: Optional URI -> (in_degree, out_degree) map aggregated
+            in the database for exactly this node set
+        edges_prefiltered: True if edge_tuples already only contains edges
+            with both endpoints in posts (skips the filtering pass)
         
     Returns:
         GraphDTO
     """
-    # Apply node limit if specified
-    if max_nodes and len(posts) > max_nodes:
-        logger.info(f"Applying max_nodes filter: {len(posts)} -> {max_nodes}")
-        
-        # Score nodes by total engagement
-        scored_posts = []
-        for post in posts:
-            score = (
-                post.like_count +
-                post.repost_count +
-                post.reply_count +
-                post.quote_count
-            )
-            scored_posts.append((score, post))
-        
-        # Sort by score descending and take top N
-        scored_posts.sort(key=lambda x: x[0], reverse=True)
-        posts = [post for _, post in scored_posts[:max_nodes]]
-    
-    # Build URI set for filtering edges
-    uri_set = {post.uri for post in posts}
-    
     # Filter edges to only include nodes in the graph
-    filtered_edges = [
-        (src, dst, etype, created)
-        for src, dst, etype, created in edge_tuples
-        if src in uri_set and dst in uri_set
-    ]
-    
-    logger.info(
-        f"Filtered edges: {len(edge_tuples)} -> {len(filtered_edges)} "
-        f"(kept edges with both endpoints in node set)"
-    )
-    
-    # Compute degrees
-    in_degree = {}
-    out_degree = {}
+    if edges_prefiltered:
+        filtered_edges = edge_tuples
+    else:
+        uri_in = {post.uri for post in posts}.__contains__
+        filtered_edges = [
+            edge
+            for edge in edge_tuples
+            if uri_in(edge[0]) and uri_in(edge[1])
+        ]
+        
+        logger.info(
+            f"Filtered edges: {len(edge_tuples)} -> {len(filtered_edges)} "
+            f"(kept edges with both endpoints in node set)"
+        )
     
-    for src, dst, _, _ in filtered_edges:
-        out_degree[src] = out_degree.get(src, 0) + 1
-        in_degree[dst] = in_degree.get(dst, 0) + 1
+    # Compute degrees unless they were aggregated in the database
+    if degrees is None:
+        in_counts = Counter(dst for _, dst, _, _ in filtered_edges)
+        out_counts = Counter(src for src, _, _, _ in filtered_edges)
+        degrees = {
+            uri: (in_counts[uri], out_counts[uri])
+            for uri in in_counts.keys() | out_counts.keys()
+        }
     
     # Build node DTOs
-    nodes = []
-    for post in posts:
-        node = GraphNode(
-            uri=post.uri,
-            text=post.text,
-            authorHandle=post.author_handle,
-            authorDid=post.author_did,
-            createdAt=post.created_at,
-            metrics=PostMetrics(
-                like_count=post.like_count,
-                repost_count=post.repost_count,
-                reply_count=post.reply_count,
-                quote_count=post.quote_count,
-            ),
-            inDegree=in_degree.get(post.uri, 0),
-            outDegree=out_degree.get(post.uri, 0),
-        )
-        nodes.append(node)
+    nodes = [_to_graph_node(post, degrees) for post in posts]
     
     # Build edge DTOs
     edges = [
@@ -278,9 +267,14 @@ def _build_graph(
     time_min = None
     time_max = None
     if posts:
-        timestamps = [post.created_at for post in posts]
-        time_min = min(timestamps)
-        time_max = max(timestamps)
+        # One pass, no intermediate list
+        time_min = time_max = posts[0].created_at
+        for post in posts:
+            created_at = post.created_at
+            if created_at < time_min:
+                time_min = created_at
+            elif created_at > time_max:
+                time_max = created_at
     
     stats = GraphStats(
         nodeCount=len(nodes),
@@ -290,3 +284,130 @@ def _build_graph(
     )
     
     return GraphDTO(nodes=nodes, edges=edges, stats=stats)
+
+
+def _to_graph_node(post: PostLike, degrees: dict[str, tuple[int, int]]) -> GraphNode:
+    """
+    Build a graph node DTO from a post.
+    
+    Args:
+        post: Post row (or Post object)
+        degrees: URI -> (in_degree, out_degree) map
+        
+    Returns:
+        GraphNode
+    """
+    in_deg, out_deg = degrees.get(post.uri, (0, 0))
+    return GraphNode(
+        uri=post.uri,
+        text=post.text,
+        authorHandle=post.author_handle,
+        authorDid=post.author_did,
+        createdAt=post.created_at,
+        metrics=PostMetrics(
+            like_count=post.like_count,
+            repost_count=post.repost_count,
+            reply_count=post.reply_count,
+            quote_count=post.quote_count,
+        ),
+        inDegree=in_deg,
+        outDegree=out_deg,
+    )
+
+
+def stream_run_graph(
+    session: Session,
+    run_id: uuid.UUID,
+    max_nodes: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    Stream the graph for a run as newline-delimited JSON.
+    
+    Emits one {"node": ...} line per node, then one {"edge": ...} line per
+    edge, then a final {"stats": ...} line. Posts and edges are read with
+    batched server-side fetches, so memory stays bounded by the batch size
+    rather than the graph size.
+    
+    Args:
+        session: Database session
+        run_id: Run UUID
+        max_nodes: Optional limit on number of nodes to return
+        
+    Returns:
+        Iterator of NDJSON-encoded lines
+        
+    Raises:
+        NotFoundError: If run does not exist
+    """
+    # Verify run exists before the response starts streaming
+    run = repo.get_run(session, run_id)
+    if not run:
+        raise NotFoundError(f"Run {run_id} not found")
+    
+    # With a node limit the top N rows are already loaded (and bounded);
+    # otherwise posts are streamed from the database
+    if max_nodes:
+        posts = repo.get_run_top_posts(session, run_id, max_nodes)
+        degrees = {post.uri: (post.in_degree, post.out_degree) for post in posts}
+        uris = list(degrees)
+    else:
+        posts = repo.iter_run_posts(session, run_id)
+        degrees = repo.get_run_node_degrees(session, run_id)
+        uris = None
+    return _iter_graph_ndjson(session, run_id, posts, uris, degrees)
+
+
+def _iter_graph_ndjson(
+    session: Session,
+    run_id: uuid.UUID,
+    posts: Iterable[PostLike],
+    uris: Optional[list[str]],
+    degrees: dict[str, tuple[int, int]],
+) -> Iterator[bytes]:
+    """
+    Generate NDJSON lines for a run's nodes, edges and stats.
+    
+    Args:
+        session: Database session
+        run_id: Run UUID
+        posts: Posts in the node set
+        uris: Node set, or None for all posts linked to the run
+        degrees: URI -> (in_degree, out_degree) map for the node set
+        
+    Yields:
+        NDJSON-encoded lines
+    """
+    node_count = 0
+    time_min = None
+    time_max = None
+    for post in posts:
+        node = _to_graph_node(post, degrees)
+        node_count += 1
+        if time_min is None or post.created_at < time_min:
+            time_min = post.created_at
+        if time_max is None or post.created_at > time_max:
+            time_max = post.created_at
+        yield _ndjson_line("node", node)
+    
+    edge_count = 0
+    for src, dst, etype in repo.iter_run_node_edges(session, run_id, uris):
+        edge_count += 1
+        yield _ndjson_line("edge", GraphEdge(src=src, dst=dst, type=etype))
+    
+    stats = GraphStats(
+        nodeCount=node_count,
+        edgeCount=edge_count,
+        timeMin=time_min,
+        timeMax=time_max,
+    )
+    yield _ndjson_line("stats", stats)
+    
+    logger.info(
+        f"Streamed graph for run {run_id}: "
+        f"{node_count} nodes, {edge_count} edges"
+    )
+
+
+def _ndjson_line(kind: str, model: BaseModel) -> bytes:
+    """Encode a DTO as a single {kind: ...} NDJSON line."""
+    return f'{{"{kind}":{model.model_dump_json(by_alias=True)}}}\n'.encode()
@@ -5,8 +5,11 @@ from .client import BlueskyClient
 
 logger = logging.getLogger(__name__)
 
+# Maximum getPosts chunk requests in flight at once
+MAX_CONCURRENT_CHUNKS = 8
 
-def search_posts(
+
+async def search_posts(
     client: BlueskyClient,
     query: str,
     limit: int = 25,
@@ -26,10 +29,10 @@ def search_posts(
         params["lang"] = lang
 
     logger.debug(f"Searching posts: query='{query}', limit={limit}")
-    return client.get("app.bsky.feed.searchPosts", params)
+    return await client.get("app.bsky.feed.searchPosts", params)
 
 
-def get_post_thread(
+async def get_post_thread(
     client: BlueskyClient,
     uri: str,
     depth: int = 6,
@@ -37,10 +40,10 @@ def get_post_thread(
 ) -> dict[str, Any]:
     params = {"uri": uri, "depth": depth, "parentHeight": parent_height}
     logger.debug(f"Fetching thread: uri={uri}, depth={depth}")
-    return client.get("app.bsky.feed.getPostThread", params)
+    return await client.get("app.bsky.feed.getPostThread", params)
 
 
-def get_quotes(
+async def get_quotes(
     client: BlueskyClient,
     uri: str,
     limit: int = 50,
@@ -51,31 +54,42 @@ def get_quotes(
         params["cursor"] = cursor
 
     logger.debug(f"Fetching quotes: uri={uri}, limit={limit}")
-    return client.get("app.bsky.feed.getQuotes", params)
+    return await client.get("app.bsky.feed.getQuotes", params)
 
 
-def get_posts(client: BlueskyClient, uris: list[str]) -> dict[str, Any]:
+async def get_posts(client: BlueskyClient, uris: list[str]) -> dict[str, Any]:
     if not uris:
         return {"posts": []}
 
     params = {"uris": uris[:25]}
     logger.debug(f"Fetching {len(uris)} posts by URI")
-    return client.get("app.bsky.feed.getPosts", params)
+    return await client.get("app.bsky.feed.getPosts", params)
 
 
-def batch_get_posts(client: BlueskyClient, uris: list[str]) -> list[dict[str, Any]]:
+async def batch_get_posts(client: BlueskyClient, uris: list[str]) -> list[dict[str, Any]]:
     if not uris:
         return []
 
-    all_posts = []
     chunk_size = 25
+    chunks = [
+        {"uris": uris[i : i + chunk_size]}
+        for i in range(0, len(uris), chunk_size)
+    ]
+
+    # Chunks are independent: one cache round-trip for all of them, then the
+    # misses are fetched concurrently. Results keep chunk order.
+    logger.debug(f"Fetching {len(uris)} posts by URI in {len(chunks)} chunks")
+    responses = await client.get_many(
+        "app.bsky.feed.getPosts",
+        chunks,
+        max_concurrency=MAX_CONCURRENT_CHUNKS,
+    )
 
-    for i in range(0, len(uris), chunk_size):
-        chunk = uris[i : i + chunk_size]
-        try:
-            response = get_posts(client, chunk)
-            all_posts.extend(response.get("posts", []))
-        except Exception as e:
-            logger.error(f"Failed to fetch post chunk {i // chunk_size}: {e}")
+    all_posts = []
+    for index, response in enumerate(responses):
+        if response is None:
+            logger.error(f"Failed to fetch post chunk {index}")
+            continue
+        all_posts.extend(response.get("posts", []))
 
     return all_posts
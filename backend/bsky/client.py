@@ -1,12 +1,15 @@
+import asyncio
 import hashlib
-import json
 import logging
 import random
+import threading
 import time
 from typing import Any, Optional
 
 import httpx
-from redis import Redis
+import orjson
+from rbloom import Bloom
+from redis.asyncio import Redis
 from redis.exceptions import RedisError
 
 from .models import IngestConfig
@@ -31,58 +34,54 @@ class RequestStats:
 
 
 class BlueskyClient:
-    """HTTP client with caching and retry logic for Bluesky API."""
+    """Async HTTP client with caching and retry logic for Bluesky API.
+
+    Independent requests can be awaited concurrently (e.g. with
+    asyncio.gather); connections are pooled and multiplexed over HTTP/2.
+    """
 
     BASE_URL = "https://api.bsky.app"
 
-    def __init__(self, config: Optional[IngestConfig] = None):
+    # XRPC endpoints used by the api module, with their request paths
+    KNOWN_ENDPOINTS = (
+        "app.bsky.feed.searchPosts",
+        "app.bsky.feed.getPostThread",
+        "app.bsky.feed.getQuotes",
+        "app.bsky.feed.getPosts",
+    )
+    _URLS = {endpoint: f"/xrpc/{endpoint}" for endpoint in KNOWN_ENDPOINTS}
+
+    def __init__(
+        self,
+        config: Optional[IngestConfig] = None,
+        pool: Optional["ConnectionPool"] = None,
+    ):
         self.config = config or IngestConfig()
         self.stats = RequestStats()
         self._request_count = 0
-        
-        # Initialize Redis client
-        self._redis: Optional[Redis] = None
-        if self.config.redis_enabled:
-            try:
-                self._redis = Redis(
-                    host=self.config.redis_host,
-                    port=self.config.redis_port,
-                    db=self.config.redis_db,
-                    decode_responses=True,
-                    socket_connect_timeout=2,
-                )
-                # Test connection
-                self._redis.ping()
-                logger.info("Redis connection established")
-            except (RedisError, Exception) as e:
-                logger.warning(f"Redis unavailable, caching disabled: {e}")
-                self._redis = None
 
-        # Initialize HTTP client
-        self._client = httpx.Client(
-            base_url=self.BASE_URL,
-            timeout=httpx.Timeout(
-                connect=self.config.connect_timeout,
-                read=self.config.read_timeout,
-                write=self.config.connect_timeout,
-                pool=self.config.connect_timeout,
-            ),
-            follow_redirects=True,
-            headers={
-                "User-Agent": "Mozilla/5.0 (compatible; SourceGraph/1.0)",
-            },
-        )
+        # Cache TTL per endpoint, resolved once instead of per request
+        self._endpoint_ttl = {
+            "app.bsky.feed.searchPosts": self.config.search_ttl,
+            "app.bsky.feed.getPostThread": self.config.thread_ttl,
+            "app.bsky.feed.getQuotes": self.config.thread_ttl,
+            "app.bsky.feed.getPosts": self.config.posts_ttl,
+        }
+
+        # Connections are only closed with the client if it opened them
+        self._owns_pool = pool is None
+        self._pool = pool or ConnectionPool(self.config)
+        self._client = self._pool.http
 
-    def close(self):
-        self._client.close()
-        if self._redis:
-            self._redis.close()
+    async def close(self):
+        if self._owns_pool:
+            await self._pool.close()
 
-    def __enter__(self):
+    async def __aenter__(self):
         return self
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
 
     def _make_cache_key(self, endpoint: str, params: dict[str, Any]) -> str:
         """Create a cache key from endpoint and params.
@@ -94,9 +93,11 @@ class BlueskyClient:
         Returns:
             Cache key string
         """
-        # Normalize params by sorting keys
-        normalized = json.dumps(params, sort_keys=True)
-        param_hash = hashlib.md5(normalized.encode()).hexdigest()
+        # Normalize params by sorting keys. repr() of the sorted items is
+        # unambiguous (strings are quoted) and cheaper than json.dumps with
+        # sort_keys; blake2b is faster than md5 and only needs to spread keys.
+        normalized = repr(sorted(params.items()))
+        param_hash = hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
         return f"bsky:{endpoint}:{param_hash}"
 
     def _get_ttl_for_endpoint(self, endpoint: str) -> int:
@@ -108,15 +109,9 @@ class BlueskyClient:
         Returns:
             TTL in seconds
         """
-        if "searchPosts" in endpoint:
-            return self.config.search_ttl
-        elif "getPostThread" in endpoint or "getQuotes" in endpoint:
-            return self.config.thread_ttl
-        elif "getPosts" in endpoint:
-            return self.config.posts_ttl
-        return self.config.search_ttl
-
-    def _get_from_cache(self, cache_key: str) -> Optional[dict]:
+        return self._endpoint_ttl.get(endpoint, self.config.search_ttl)
+
+    async def _get_from_cache(self, cache_key: str) -> Optional[dict]:
         """Get response from cache.
 
         Args:
@@ -125,21 +120,25 @@ class BlueskyClient:
         Returns:
             Cached response or None
         """
-        if not self._redis:
+        redis = await self._pool.get_redis()
+        if not redis:
+            return None
+        cached_keys = self._pool.cached_keys
+        if cached_keys is not None and cache_key not in cached_keys:
             return None
 
         try:
-            cached = self._redis.get(cache_key)
+            cached = await redis.get(cache_key)
             if cached:
                 self.stats.cache_hits += 1
                 logger.debug(f"Cache hit: {cache_key}")
-                return json.loads(cached)
+                return orjson.loads(cached)
         except (RedisError, Exception) as e:
             logger.warning(f"Cache read error: {e}")
 
         return None
 
-    def _set_cache(self, cache_key: str, data: dict, ttl: int):
+    async def _set_cache(self, cache_key: str, data: dict, ttl: int):
         """Set response in cache.
 
         Args:
@@ -147,22 +146,84 @@ class BlueskyClient:
             data: Data to cache
             ttl: Time to live in seconds
         """
-        if not self._redis:
+        redis = await self._pool.get_redis()
+        if not redis:
             return
 
         try:
-            self._redis.setex(cache_key, ttl, json.dumps(data))
+            await redis.setex(cache_key, ttl, orjson.dumps(data))
+            if self._pool.cached_keys is not None:
+                self._pool.cached_keys.add(cache_key)
             logger.debug(f"Cached: {cache_key} (TTL: {ttl}s)")
         except (RedisError, Exception) as e:
             logger.warning(f"Cache write error: {e}")
 
+    async def _get_many_from_cache(self, cache_keys: list[str]) -> list[Optional[dict]]:
+        """Get several responses from cache in one MGET round-trip.
+
+        Args:
+            cache_keys: Cache keys
+
+        Returns:
+            Cached response or None for each key, in order
+        """
+        results: list[Optional[dict]] = [None] * len(cache_keys)
+        redis = await self._pool.get_redis()
+        if not redis:
+            return results
+
+        cached_keys = self._pool.cached_keys
+        if cached_keys is None:
+            indices = list(range(len(cache_keys)))
+        else:
+            indices = [i for i, key in enumerate(cache_keys) if key in cached_keys]
+        if not indices:
+            return results
+
+        try:
+            cached = await redis.mget([cache_keys[i] for i in indices])
+        except (RedisError, Exception) as e:
+            logger.warning(f"Cache read error: {e}")
+            return results
+
+        for index, value in zip(indices, cached):
+            if value:
+                self.stats.cache_hits += 1
+                logger.debug(f"Cache hit: {cache_keys[index]}")
+                results[index] = orjson.loads(value)
+        return results
+
+    async def _set_many_cache(self, entries: list[tuple[str, dict]], ttl: int):
+        """Set several responses in cache with one pipelined round-trip.
+
+        Args:
+            entries: (cache_key, data) pairs
+            ttl: Time to live in seconds
+        """
+        if not entries:
+            return
+        redis = await self._pool.get_redis()
+        if not redis:
+            return
+
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for cache_key, data in entries:
+                    pipe.set(cache_key, orjson.dumps(data), ex=ttl)
+                await pipe.execute()
+            if self._pool.cached_keys is not None:
+                self._pool.cached_keys.update(cache_key for cache_key, _ in entries)
+            logger.debug(f"Cached {len(entries)} responses (TTL: {ttl}s)")
+        except (RedisError, Exception) as e:
+            logger.warning(f"Cache write error: {e}")
+
     def _check_budget(self):
         if self._request_count >= self.config.max_requests_per_run:
             raise RuntimeError(
                 f"Request budget exhausted ({self.config.max_requests_per_run})"
             )
 
-    def get(self, endpoint: str, params: Optional[dict[str, Any]] = None) -> dict:
+    async def get(self, endpoint: str, params: Optional[dict[str, Any]] = None) -> dict:
         self._check_budget()
 
         params = params or {}
@@ -170,13 +231,77 @@ class BlueskyClient:
         ttl = self._get_ttl_for_endpoint(endpoint)
 
         # Try cache first
-        cached = self._get_from_cache(cache_key)
+        cached = await self._get_from_cache(cache_key)
         if cached is not None:
             return cached
 
         self.stats.cache_misses += 1
 
-        # Make request with retry logic
+        data = await self._fetch(endpoint, params)
+        await self._set_cache(cache_key, data, ttl)
+        return data
+
+    async def get_many(
+        self,
+        endpoint: str,
+        params_list: list[dict[str, Any]],
+        max_concurrency: int = 8,
+    ) -> list[Optional[dict]]:
+        """Fetch several requests to one endpoint, batching cache access.
+
+        All cache keys are read with a single MGET; misses are fetched
+        concurrently (at most max_concurrency at a time) and written back
+        in one pipelined round-trip.
+
+        Args:
+            endpoint: API endpoint name
+            params_list: Query parameters for each request
+            max_concurrency: Maximum HTTP requests in flight
+
+        Returns:
+            Response for each request, in order; None where the fetch failed
+        """
+        self._check_budget()
+
+        cache_keys = [self._make_cache_key(endpoint, params) for params in params_list]
+        results = await self._get_many_from_cache(cache_keys)
+        misses = [i for i, cached in enumerate(results) if cached is None]
+        self.stats.cache_misses += len(misses)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(index: int) -> Optional[dict]:
+            async with semaphore:
+                try:
+                    return await self._fetch(endpoint, params_list[index])
+                except Exception as e:
+                    logger.error(f"Request {index} to {endpoint} failed: {e}")
+                    return None
+
+        fetched = await asyncio.gather(*(fetch(i) for i in misses))
+
+        entries = []
+        for index, data in zip(misses, fetched):
+            results[index] = data
+            if data is not None:
+                entries.append((cache_keys[index], data))
+        await self._set_many_cache(entries, self._get_ttl_for_endpoint(endpoint))
+
+        return results
+
+    async def _fetch(self, endpoint: str, params: dict[str, Any]) -> dict:
+        """Request an endpoint with retry logic, bypassing the cache.
+
+        Args:
+            endpoint: API endpoint name
+            params: Query parameters
+
+        Returns:
+            Parsed JSON response
+        """
+        self._check_budget()
+
+        url = self._URLS.get(endpoint) or f"/xrpc/{endpoint}"
         attempt = 0
         backoff = self.config.initial_backoff
 
@@ -186,7 +311,7 @@ class BlueskyClient:
                 self._request_count += 1
                 self.stats.total_requests += 1
 
-                response = self._client.get(f"/xrpc/{endpoint}", params=params)
+                response = await self._client.get(url, params=params)
                 latency = time.time() - start_time
 
                 logger.info(
@@ -203,7 +328,7 @@ class BlueskyClient:
                         else backoff + random.uniform(0, 1)
                     )
                     logger.warning(f"Rate limited, waiting {wait_time:.2f}s")
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                     backoff = min(backoff * 2, self.config.max_backoff)
                     attempt += 1
                     continue
@@ -213,7 +338,7 @@ class BlueskyClient:
                     logger.warning(
                         f"Server error {response.status_code}, retrying in {backoff:.2f}s"
                     )
-                    time.sleep(backoff + random.uniform(0, 1))
+                    await asyncio.sleep(backoff + random.uniform(0, 1))
                     backoff = min(backoff * 2, self.config.max_backoff)
                     attempt += 1
                     continue
@@ -221,10 +346,7 @@ class BlueskyClient:
                 # Raise for other errors
                 response.raise_for_status()
 
-                # Parse and cache response
-                data = response.json()
-                self._set_cache(cache_key, data, ttl)
-                return data
+                return orjson.loads(response.content)
 
             except httpx.HTTPError as e:
                 self.stats.failed_requests += 1
@@ -232,7 +354,7 @@ class BlueskyClient:
                 if attempt >= self.config.max_retries - 1:
                     raise RuntimeError(f"Max retries reached for {endpoint}: {e}")
                 backoff = min(backoff * 2, self.config.max_backoff)
-                time.sleep(backoff + random.uniform(0, 1))
+                await asyncio.sleep(backoff + random.uniform(0, 1))
                 attempt += 1
 
         raise RuntimeError(f"Failed to fetch {endpoint} after {self.config.max_retries} attempts")
@@ -245,3 +367,169 @@ class BlueskyClient:
 
     def get_remaining_budget(self) -> int:
         return max(0, self.config.max_requests_per_run - self._request_count)
+
+
+class ConnectionPool:
+    """HTTP and Redis connections, shareable by several clients.
+
+    The httpx and Redis connections are bound to the event loop that opened
+    them, so a pool must only be used from one loop.
+    """
+
+    # Connection pool size, shared by all concurrent requests
+    MAX_CONNECTIONS = 16
+
+    # Cache keys the Bloom filter is sized for; past this its false
+    # positive rate (and so the share of wasted Redis reads) creeps up.
+    # Also bounds the startup scan that seeds it.
+    CACHED_KEYS_CAPACITY = 100_000
+
+    def __init__(self, config: IngestConfig):
+        self.config = config
+
+        # Initialize Redis client; it connects on first use (see get_redis)
+        self.redis: Optional[Redis] = None
+        if config.redis_enabled:
+            self.redis = Redis(
+                host=config.redis_host,
+                port=config.redis_port,
+                db=config.redis_db,
+                # Values stay bytes, which orjson parses directly
+                decode_responses=False,
+                socket_connect_timeout=2,
+            )
+        self._redis_checked = False
+        self._redis_lock = asyncio.Lock()
+
+        # Optional Bloom filter of keys known to be in the cache, so lookups
+        # of keys never cached skip the Redis round-trip. False positives
+        # (including keys that have since expired) just fall through to
+        # Redis. Seeded from Redis so entries cached before this process
+        # started still hit.
+        self.cached_keys: Optional[Bloom] = None
+
+        # Initialize HTTP client
+        self.http = httpx.AsyncClient(
+            base_url=BlueskyClient.BASE_URL,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=self.MAX_CONNECTIONS,
+                max_keepalive_connections=self.MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(
+                connect=config.connect_timeout,
+                read=config.read_timeout,
+                write=config.connect_timeout,
+                pool=config.connect_timeout,
+            ),
+            follow_redirects=True,
+            headers={
+                "User-Agent": "Mozilla/5.0 (compatible; SourceGraph/1.0)",
+            },
+        )
+
+    async def get_redis(self) -> Optional[Redis]:
+        """Get the Redis client, checking the connection on first use.
+
+        Returns:
+            Redis client, or None if caching is disabled or Redis is down
+        """
+        if not self._redis_checked:
+            async with self._redis_lock:
+                if not self._redis_checked:
+                    await self._connect_redis()
+                    self._redis_checked = True
+        return self.redis
+
+    async def _connect_redis(self):
+        """Ping Redis and seed the cache key filter."""
+        if not self.redis:
+            return
+
+        try:
+            await self.redis.ping()
+            logger.info("Redis connection established")
+        except (RedisError, Exception) as e:
+            logger.warning(f"Redis unavailable, caching disabled: {e}")
+            await self.redis.aclose()
+            self.redis = None
+            return
+
+        if self.config.cache_key_filter:
+            self.cached_keys = await self._scan_cached_keys()
+
+    async def _scan_cached_keys(self) -> Optional[Bloom]:
+        """Build the cache key filter from the keys already in Redis.
+
+        Returns:
+            Filter of the cached keys, or None if the scan failed or found
+            more keys than the filter is sized for (a partial filter would
+            hide cached entries)
+        """
+        cached_keys = Bloom(self.CACHED_KEYS_CAPACITY, 0.01)
+        count = 0
+        try:
+            async for key in self.redis.scan_iter(match="bsky:*", count=1000):
+                count += 1
+                if count > self.CACHED_KEYS_CAPACITY:
+                    logger.warning(
+                        f"Over {self.CACHED_KEYS_CAPACITY} cached keys, "
+                        f"cache key filter disabled"
+                    )
+                    return None
+                cached_keys.add(key.decode())
+        except (RedisError, Exception) as e:
+            logger.warning(f"Cache key scan failed, filter disabled: {e}")
+            return None
+        return cached_keys
+
+    async def close(self):
+        await self.http.aclose()
+        if self.redis:
+            await self.redis.aclose()
+
+
+# Pools reused across runs, keyed by the settings they were opened with
+_shared_pools: dict[tuple, ConnectionPool] = {}
+_shared_pools_lock = threading.Lock()
+
+
+def get_shared_client(config: Optional[IngestConfig] = None) -> BlueskyClient:
+    """Get a client whose connections are kept open across runs.
+
+    Reusing the pool skips the TCP/TLS handshake (and the Redis connect and
+    ping) on every run. The request budget and statistics still belong to
+    the returned client, so concurrent runs don't share them. Closing the
+    client leaves the pool open; see close_shared_clients.
+
+    Args:
+        config: Ingestion configuration
+
+    Returns:
+        BlueskyClient backed by the shared pool for this configuration
+    """
+    config = config or IngestConfig()
+    key = (
+        config.redis_enabled,
+        config.redis_host,
+        config.redis_port,
+        config.redis_db,
+        # The cache key filter lives on the pool
+        config.cache_key_filter,
+        config.connect_timeout,
+        config.read_timeout,
+    )
+    with _shared_pools_lock:
+        pool = _shared_pools.get(key)
+        if pool is None:
+            pool = _shared_pools[key] = ConnectionPool(config)
+    return BlueskyClient(config, pool=pool)
+
+
+async def close_shared_clients():
+    """Close all pools opened by get_shared_client."""
+    with _shared_pools_lock:
+        pools = list(_shared_pools.values())
+        _shared_pools.clear()
+    for pool in pools:
+        await pool.close()
@@ -1,19 +1,77 @@
+import asyncio
 import logging
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from . import api, normalize
-from .client import BlueskyClient
+from .client import BlueskyClient, close_shared_clients, get_shared_client
 from .models import IngestConfig, IngestResult, QueryModeInputs, SeedModeInputs
 
 logger = logging.getLogger(__name__)
 
+# searchPosts since/until bounds, second precision in UTC
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Runs execute on one long-lived event loop, so the shared client's
+# connections (bound to the loop that opened them) survive across runs
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _run(coro):
+    """Run a coroutine on the ingest event loop and wait for its result."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever,
+                name="bsky-ingest",
+                daemon=True,
+            ).start()
+        loop = _loop
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def shutdown():
+    """Close the shared connections and stop the ingest event loop."""
+    global _loop
+    with _loop_lock:
+        loop, _loop = _loop, None
+    if loop is None:
+        return
+    asyncio.run_coroutine_threadsafe(close_shared_clients(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def _prepare_client(
+    client: Optional[BlueskyClient],
+    config: IngestConfig,
+) -> BlueskyClient:
+    """Get the client for a run, with fresh statistics and budget."""
+    if client is None:
+        return get_shared_client(config)
+    client.reset_stats()
+    client.reset_budget()
+    return client
+
 
 def query_mode(
     inputs: QueryModeInputs,
     config: Optional[IngestConfig] = None,
+    client: Optional[BlueskyClient] = None,
+) -> IngestResult:
+    return _run(_query_mode(inputs, config, client))
+
+
+async def _query_mode(
+    inputs: QueryModeInputs,
+    config: Optional[IngestConfig] = None,
+    client: Optional[BlueskyClient] = None,
 ) -> IngestResult:
     config = config or IngestConfig()
+    client = _prepare_client(client, config)
     page_size = min(inputs.page_size, config.max_page_size)
     
     logger.info(
@@ -21,78 +79,89 @@ def query_mode(
         f"pages={inputs.max_pages}, page_size={page_size}"
     )
 
-    all_posts = []
-
-    with BlueskyClient(config) as client:
-        since = None
-        until = None
-        if inputs.time_window_hours:
-            now = datetime.utcnow()
-            since = (now - timedelta(hours=inputs.time_window_hours)).isoformat() + "Z"
-            until = now.isoformat() + "Z"
+    all_posts: dict[str, normalize.Post] = {}
 
-        cursor = None
-        pages_fetched = 0
+    since = None
+    until = None
+    if inputs.time_window_hours:
+        now = datetime.now(timezone.utc)
+        since = (now - timedelta(hours=inputs.time_window_hours)).strftime(TIMESTAMP_FORMAT)
+        until = now.strftime(TIMESTAMP_FORMAT)
 
-        while pages_fetched < inputs.max_pages:
-            try:
-                response = api.search_posts(
-                    client=client,
-                    query=inputs.query,
-                    limit=page_size,
-                    cursor=cursor,
-                    since=since,
-                    until=until,
-                    lang=inputs.lang,
-                )
+    cursor = None
+    pages_fetched = 0
 
-                raw_posts = response.get("posts", [])
-                for raw_post in raw_posts:
-                    post = normalize.normalize_post(raw_post)
-                    if post:
-                        all_posts.append(post)
+    while pages_fetched < inputs.max_pages:
+        try:
+            response = await api.search_posts(
+                client=client,
+                query=inputs.query,
+                limit=page_size,
+                cursor=cursor,
+                since=since,
+                until=until,
+                lang=inputs.lang,
+            )
 
-                pages_fetched += 1
-                logger.info(
-                    f"Fetched page {pages_fetched}/{inputs.max_pages} "
-                    f"({len(raw_posts)} posts)"
-                )
+            # Pages can overlap; keep the first copy of each post and skip
+            # normalizing ones already seen
+            raw_posts = response.get("posts", [])
+            new_posts = normalize.normalize_posts(
+                raw_post for raw_post in raw_posts
+                if raw_post.get("uri") not in all_posts
+            )
+            for post in new_posts:
+                all_posts.setdefault(post.uri, post)
 
-                cursor = response.get("cursor")
-                if not cursor:
-                    logger.info("No more pages available")
-                    break
+            pages_fetched += 1
+            logger.info(
+                f"Fetched page {pages_fetched}/{inputs.max_pages} "
+                f"({len(raw_posts)} posts)"
+            )
 
-                if client.get_remaining_budget() < 10:
-                    logger.warning("Request budget low, stopping pagination")
-                    break
+            cursor = response.get("cursor")
+            if not cursor:
+                logger.info("No more pages available")
+                break
 
-            except Exception as e:
-                logger.error(f"Error fetching page {pages_fetched + 1}: {e}")
+            if client.get_remaining_budget() < 10:
+                logger.warning("Request budget low, stopping pagination")
                 break
 
-        all_posts = normalize.deduplicate_posts(all_posts)
+        except Exception as e:
+            logger.error(f"Error fetching page {pages_fetched + 1}: {e}")
+            break
 
-        logger.info(
-            f"Query mode complete: {len(all_posts)} unique posts, "
-            f"{client.stats.total_requests} requests, "
-            f"{client.stats.cache_hits} cache hits"
-        )
+    logger.info(
+        f"Query mode complete: {len(all_posts)} unique posts, "
+        f"{client.stats.total_requests} requests, "
+        f"{client.stats.cache_hits} cache hits"
+    )
 
-        return IngestResult(
-            posts=all_posts,
-            edges=[],
-            total_requests=client.stats.total_requests,
-            cache_hits=client.stats.cache_hits,
-            cache_misses=client.stats.cache_misses,
-        )
+    return IngestResult(
+        posts=list(all_posts.values()),
+        edges=[],
+        total_requests=client.stats.total_requests,
+        cache_hits=client.stats.cache_hits,
+        cache_misses=client.stats.cache_misses,
+    )
 
 
 def seed_mode(
     inputs: SeedModeInputs,
     config: Optional[IngestConfig] = None,
+    client: Optional[BlueskyClient] = None,
+) -> IngestResult:
+    return _run(_seed_mode(inputs, config, client))
+
+
+async def _seed_mode(
+    inputs: SeedModeInputs,
+    config: Optional[IngestConfig] = None,
+    client: Optional[BlueskyClient] = None,
 ) -> IngestResult:
     config = config or IngestConfig()
+    client = _prepare_client(client, config)
 
     logger.info(
         f"Starting seed mode: seed_uri={inputs.seed_uri}, "
@@ -100,114 +169,133 @@ def seed_mode(
     )
 
     all_posts: dict[str, normalize.Post] = {}
-    all_edges: list[normalize.Edge] = []
+    # Edges dedupe as they arrive (Edge hashes and compares by its key);
+    # the first copy of each is kept
+    all_edges: dict[normalize.Edge, None] = {}
+
+    # The thread and the first quote page don't depend on each other,
+    # so fetch them concurrently; later quote pages need the cursor
+    logger.info("Fetching seed post thread and first quote page...")
+    fetches = [
+        api.get_post_thread(
+            client=client,
+            uri=inputs.seed_uri,
+            depth=inputs.max_depth,
+            parent_height=3,
+        )
+    ]
+    if inputs.max_quote_pages > 0:
+        fetches.append(
+            api.get_quotes(client=client, uri=inputs.seed_uri, limit=50)
+        )
+    thread_response, *first_quote_page = await asyncio.gather(
+        *fetches,
+        return_exceptions=True,
+    )
 
-    with BlueskyClient(config) as client:
-        try:
-            logger.info("Fetching seed post thread...")
-            thread_response = api.get_post_thread(
-                client=client,
-                uri=inputs.seed_uri,
-                depth=inputs.max_depth,
-                parent_height=3,
-            )
+    try:
+        if isinstance(thread_response, Exception):
+            raise thread_response
 
-            thread_posts, thread_edges = normalize.extract_thread_posts_and_edges(
-                thread_response,
-                max_depth=inputs.max_depth,
-            )
+        thread_posts, thread_edges = normalize.extract_thread_posts_and_edges(
+            thread_response,
+            max_depth=inputs.max_depth,
+        )
 
-            all_posts.update(thread_posts)
-            all_edges.extend(thread_edges)
+        all_posts.update(thread_posts)
+        all_edges.update(dict.fromkeys(thread_edges))
 
-            logger.info(
-                f"Thread extraction: {len(thread_posts)} posts, "
-                f"{len(thread_edges)} edges"
-            )
+        logger.info(
+            f"Thread extraction: {len(thread_posts)} posts, "
+            f"{len(thread_edges)} edges"
+        )
 
-        except Exception as e:
-            logger.error(f"Failed to fetch thread for {inputs.seed_uri}: {e}")
-
-        if len(all_posts) >= inputs.max_nodes:
-            logger.warning(f"Reached max_nodes ({inputs.max_nodes}) after thread")
-            all_posts_list = list(all_posts.values())[: inputs.max_nodes]
-            all_edges = normalize.deduplicate_edges(all_edges)
-
-            return IngestResult(
-                posts=all_posts_list,
-                edges=all_edges,
-                total_requests=client.stats.total_requests,
-                cache_hits=client.stats.cache_hits,
-                cache_misses=client.stats.cache_misses,
-            )
+    except Exception as e:
+        logger.error(f"Failed to fetch thread for {inputs.seed_uri}: {e}")
 
-        try:
-            logger.info("Fetching quote posts...")
-            cursor = None
-            quote_pages_fetched = 0
+    if len(all_posts) >= inputs.max_nodes:
+        logger.warning(f"Reached max_nodes ({inputs.max_nodes}) after thread")
+        all_posts_list = list(all_posts.values())[: inputs.max_nodes]
 
-            while quote_pages_fetched < inputs.max_quote_pages:
-                try:
-                    quote_response = api.get_quotes(
+        return IngestResult(
+            posts=all_posts_list,
+            edges=list(all_edges),
+            total_requests=client.stats.total_requests,
+            cache_hits=client.stats.cache_hits,
+            cache_misses=client.stats.cache_misses,
+        )
+
+    try:
+        logger.info("Fetching quote posts...")
+        cursor = None
+        quote_pages_fetched = 0
+
+        while quote_pages_fetched < inputs.max_quote_pages:
+            try:
+                if quote_pages_fetched == 0:
+                    quote_response = first_quote_page[0]
+                    if isinstance(quote_response, Exception):
+                        raise quote_response
+                else:
+                    quote_response = await api.get_quotes(
                         client=client,
                         uri=inputs.seed_uri,
                         limit=50,
                         cursor=cursor,
                     )
 
-                    raw_quote_posts = quote_response.get("posts", [])
-                    quote_posts, quote_edges = normalize.extract_quote_edges(
-                        raw_quote_posts,
-                        inputs.seed_uri,
-                    )
-
-                    for post in quote_posts:
-                        if len(all_posts) >= inputs.max_nodes:
-                            logger.warning(f"Reached max_nodes ({inputs.max_nodes})")
-                            break
-                        all_posts[post.uri] = post
+                raw_quote_posts = quote_response.get("posts", [])
+                quote_posts, quote_edges = normalize.extract_quote_edges(
+                    raw_quote_posts,
+                    inputs.seed_uri,
+                )
 
-                    all_edges.extend(quote_edges)
+                for post in quote_posts:
+                    if len(all_posts) >= inputs.max_nodes:
+                        logger.warning(f"Reached max_nodes ({inputs.max_nodes})")
+                        break
+                    all_posts[post.uri] = post
 
-                    quote_pages_fetched += 1
-                    logger.info(
-                        f"Fetched quote page {quote_pages_fetched}/{inputs.max_quote_pages} "
-                        f"({len(quote_posts)} posts)"
-                    )
+                all_edges.update(dict.fromkeys(quote_edges))
 
-                    cursor = quote_response.get("cursor")
-                    if not cursor:
-                        logger.info("No more quote pages available")
-                        break
+                quote_pages_fetched += 1
+                logger.info(
+                    f"Fetched quote page {quote_pages_fetched}/{inputs.max_quote_pages} "
+                    f"({len(quote_posts)} posts)"
+                )
 
-                    if client.get_remaining_budget() < 10:
-                        logger.warning("Request budget low, stopping quote pagination")
-                        break
+                cursor = quote_response.get("cursor")
+                if not cursor:
+                    logger.info("No more quote pages available")
+                    break
 
-                    if len(all_posts) >= inputs.max_nodes:
-                        break
+                if client.get_remaining_budget() < 10:
+                    logger.warning("Request budget low, stopping quote pagination")
+                    break
 
-                except Exception as e:
-                    logger.error(f"Error fetching quote page {quote_pages_fetched + 1}: {e}")
+                if len(all_posts) >= inputs.max_nodes:
                     break
 
-        except Exception as e:
-            logger.error(f"Failed to fetch quotes for {inputs.seed_uri}: {e}")
+            except Exception as e:
+                logger.error(f"Error fetching quote page {quote_pages_fetched + 1}: {e}")
+                break
 
-        all_edges = normalize.deduplicate_edges(all_edges)
-        all_posts_list = list(all_posts.values())[: inputs.max_nodes]
+    except Exception as e:
+        logger.error(f"Failed to fetch quotes for {inputs.seed_uri}: {e}")
 
-        logger.info(
-            f"Seed mode complete: {len(all_posts_list)} unique posts, "
-            f"{len(all_edges)} unique edges, "
-            f"{client.stats.total_requests} requests, "
-            f"{client.stats.cache_hits} cache hits"
-        )
+    all_posts_list = list(all_posts.values())[: inputs.max_nodes]
 
-        return IngestResult(
-            posts=all_posts_list,
-            edges=all_edges,
-            total_requests=client.stats.total_requests,
-            cache_hits=client.stats.cache_hits,
-            cache_misses=client.stats.cache_misses,
-        )
+    logger.info(
+        f"Seed mode complete: {len(all_posts_list)} unique posts, "
+        f"{len(all_edges)} unique edges, "
+        f"{client.stats.total_requests} requests, "
+        f"{client.stats.cache_hits} cache hits"
+    )
+
+    return IngestResult(
+        posts=all_posts_list,
+        edges=list(all_edges),
+        total_requests=client.stats.total_requests,
+        cache_hits=client.stats.cache_hits,
+        cache_misses=client.stats.cache_misses,
+    )
@@ -1,25 +1,35 @@
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Literal, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
 
-class PostMetrics(BaseModel):
-    """Post engagement metrics."""
+# PostMetrics, Post and Edge are created in bulk on the ingest path from
+# already-parsed API data, so they are plain slotted dataclasses: no
+# per-instance __dict__ and no validation on construction. Boundary inputs
+# below stay Pydantic.
+@dataclass(slots=True)
+class PostMetrics:
+    """Post engagement metrics.
+
+    Read-only once normalized: posts without engagement share one instance.
+    """
     like_count: int = 0
     repost_count: int = 0
     reply_count: int = 0
     quote_count: int = 0
 
 
-class Post(BaseModel):
+@dataclass(slots=True, eq=False)
+class Post:
     """Normalized post object."""
     uri: str
-    cid: Optional[str] = None
     author_did: str
     author_handle: str
     created_at: datetime
+    cid: Optional[str] = None
     text: str = ""
-    metrics: PostMetrics = Field(default_factory=PostMetrics)
+    metrics: PostMetrics = field(default_factory=PostMetrics)
 
     def __hash__(self):
         return hash(self.uri)
@@ -30,7 +40,16 @@ class Post(BaseModel):
         return self.uri == other.uri
 
 
-class Edge(BaseModel):
+class _CachedHash:
+    """Slot for a lazily computed hash, kept out of the dataclass fields."""
+    __slots__ = ("_hash",)
+
+
+# Edges are hashed repeatedly during dedup and their key fields are never
+# reassigned, so the tuple hash is computed once and kept. (Post hashes its
+# uri str, whose hash CPython already caches.)
+@dataclass(slots=True, eq=False)
+class Edge(_CachedHash):
     """Normalized edge representing relationships between posts."""
     src_uri: str
     dst_uri: str
@@ -38,7 +57,11 @@ class Edge(BaseModel):
     created_at: Optional[datetime] = None
 
     def __hash__(self):
-        return hash((self.src_uri, self.dst_uri, self.edge_type))
+        try:
+            return self._hash
+        except AttributeError:
+            h = self._hash = hash((self.src_uri, self.dst_uri, self.edge_type))
+            return h
 
     def __eq__(self, other):
         if not isinstance(other, Edge):
@@ -57,6 +80,10 @@ class IngestConfig(BaseModel):
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
+    # Skip Redis reads for keys this process hasn't seen cached. Keys other
+    # processes write after startup are invisible to it, so only enable
+    # when this process is the only writer to its Redis.
+    cache_key_filter: bool = False
     
     # Cache TTLs (seconds)
     search_ttl: int = 120
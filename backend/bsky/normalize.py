@@ -1,16 +1,32 @@
 import logging
+import sys
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 from .models import Edge, Post, PostMetrics
 
+try:
+    # C ISO-8601 parser, several times faster than fromisoformat
+    from ciso8601 import parse_datetime as _parse_iso8601
+except ImportError:
+    _parse_iso8601 = None
+
 logger = logging.getLogger(__name__)
 
+# Shared by every post without engagement (fresh posts often have none)
+_NO_ENGAGEMENT = PostMetrics()
+
 
 def parse_timestamp(timestamp_str: Optional[str]) -> Optional[datetime]:
     if not timestamp_str:
         return None
 
+    if _parse_iso8601 is not None:
+        try:
+            return _parse_iso8601(timestamp_str)
+        except (ValueError, TypeError):
+            pass  # Fall through so failures are handled (and logged) below
+
     try:
         if timestamp_str.endswith("Z"):
             timestamp_str = timestamp_str[:-1] + "+00:00"
@@ -20,54 +36,110 @@ def parse_timestamp(timestamp_str: Optional[str]) -> Optional[datetime]:
         return None
 
 
-def normalize_post(post_data: dict[str, Any]) -> Optional[Post]:
+class _FallbackClock:
+    """Time for posts without a valid timestamp: the given now, else the
+    clock, read on first use and then fixed so one batch shares it."""
+    __slots__ = ("_now",)
+
+    def __init__(self, now: Optional[datetime] = None):
+        self._now = now
+
+    def __call__(self) -> datetime:
+        if self._now is None:
+            self._now = datetime.now()
+        return self._now
+
+
+def normalize_post(
+    post_data: dict[str, Any],
+    now: Optional[datetime] = None,
+) -> Optional[Post]:
+    return _normalize_post(post_data, _FallbackClock(now))
+
+
+def _normalize_post(post_data: dict[str, Any], clock: _FallbackClock) -> Optional[Post]:
     try:
-        uri = post_data.get("uri")
-        if not uri:
-            logger.warning("Post missing URI, skipping")
-            return None
+        return _build_post(post_data, clock)
+    except Exception as e:
+        logger.error(f"Failed to normalize post: {e}", exc_info=True)
+        return None
 
-        cid = post_data.get("cid")
 
-        author = post_data.get("author", {})
-        author_did = author.get("did")
-        author_handle = author.get("handle")
+def normalize_posts(
+    post_data_list: Iterable[dict[str, Any]],
+    now: Optional[datetime] = None,
+) -> list[Post]:
+    """Normalize API post views, skipping (and logging) invalid ones.
 
-        if not author_did or not author_handle:
-            logger.warning(f"Post {uri} missing author info, skipping")
-            return None
+    Posts without a valid timestamp get now, or when not given the current
+    time, read from the clock at most once per batch.
+    """
+    posts: list[Post] = []
+    append = posts.append
+    build = _build_post
+    clock = _FallbackClock(now)
+
+    for post_data in post_data_list:
+        try:
+            post = build(post_data, clock)
+        except Exception as e:
+            logger.error(f"Failed to normalize post: {e}", exc_info=True)
+            continue
+        if post is not None:
+            append(post)
 
-        record = post_data.get("record", {})
-        text = record.get("text", "")
-        created_at_str = record.get("createdAt") or post_data.get("indexedAt")
-        created_at = parse_timestamp(created_at_str)
+    return posts
 
-        if not created_at:
-            logger.warning(f"Post {uri} has invalid timestamp, using current time")
-            created_at = datetime.now()
 
-        metrics = PostMetrics(
-            like_count=post_data.get("likeCount", 0),
-            repost_count=post_data.get("repostCount", 0),
-            reply_count=post_data.get("replyCount", 0),
-            quote_count=post_data.get("quoteCount", 0),
-        )
+def _build_post(post_data: dict[str, Any], clock: _FallbackClock) -> Optional[Post]:
+    """Build a Post from an API post view, or None (logged) if it's invalid."""
+    get = post_data.get
+    uri = get("uri")
+    if not uri:
+        logger.warning("Post missing URI, skipping")
+        return None
 
-        return Post(
-            uri=uri,
-            cid=cid,
-            author_did=author_did,
-            author_handle=author_handle,
-            created_at=created_at,
-            text=text,
-            metrics=metrics,
-        )
+    author = get("author", {})
+    author_did = author.get("did")
+    author_handle = author.get("handle")
 
-    except Exception as e:
-        logger.error(f"Failed to normalize post: {e}", exc_info=True)
+    if not author_did or not author_handle:
+        logger.warning(f"Post {uri} missing author info, skipping")
         return None
 
+    record = get("record", {})
+    created_at = parse_timestamp(record.get("createdAt") or get("indexedAt"))
+
+    if not created_at:
+        logger.warning(f"Post {uri} has invalid timestamp, using current time")
+        created_at = clock()
 
+    likes = get("likeCount")
+    reposts = get("repostCount")
+    replies = get("replyCount")
+    quotes = get("quoteCount")
+    if likes or reposts or replies or quotes:
+        metrics = PostMetrics(
+            likes or 0,
+            reposts or 0,
+            replies or 0,
+            quotes or 0,
+        )
+    else:
+        metrics = _NO_ENGAGEMENT
+
+    # Intern identifiers so every Post/Edge (and the sets/dicts keyed by
+    # them) share one string object per URI and per author
+    intern = sys.intern
+    return Post(
+        uri=intern(uri),
+        cid=get("cid"),
+        author_did=intern(author_did),
+        author_handle=intern(author_handle),
+        created_at=created_at,
+        text=record.get("text", ""),
+        metrics=metrics,
+    )
 
 
 def normalize_thread_node(
@@ -78,67 +150,76 @@ def normalize_thread_node(
     max_depth: int = 10,
     current_depth: int = 0,
 ) -> Optional[str]:
-    if current_depth >= max_depth:
-        return None
+    # Keys of the edges already in edges, so duplicates are found with a set
+    # lookup instead of scanning the list
+    seen_edges = {(edge.src_uri, edge.dst_uri, edge.edge_type) for edge in edges}
+
+    # Fallback time for posts without a valid timestamp, read at most once
+    # per thread
+    clock = _FallbackClock()
+
+    # Walk the thread with an explicit stack of (node, parent_uri, depth)
+    # instead of recursing. Children are pushed in reverse so nodes are
+    # visited in the same order as a recursive walk: the node, its parent
+    # chain, then each reply subtree.
+    root_uri = None
+    stack = [(node, parent_uri, current_depth)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, parent_uri, depth = pop()
+        if depth >= max_depth:
+            continue
 
-    node_type = node.get("$type")
-
-    if node_type == "app.bsky.feed.defs#threadViewPost":
-        post_data = node.get("post")
-        if not post_data:
-            return None
-
-        post = normalize_post(post_data)
-        if not post:
-            return None
-
-        posts[post.uri] = post
-
-        if parent_uri:
-            edge = Edge(
-                src_uri=post.uri,
-                dst_uri=parent_uri,
-                edge_type="REPLY",
-                created_at=post.created_at,
-            )
-            if edge not in edges:
-                edges.append(edge)
-
-        parent_node = node.get("parent")
-        if parent_node:
-            normalize_thread_node(
-                parent_node,
-                posts,
-                edges,
-                parent_uri=post.uri,
-                max_depth=max_depth,
-                current_depth=current_depth + 1,
-            )
-
-        replies = node.get("replies", [])
-        for reply_node in replies:
-            normalize_thread_node(
-                reply_node,
-                posts,
-                edges,
-                parent_uri=post.uri,
-                max_depth=max_depth,
-                current_depth=current_depth + 1,
-            )
-
-        return post.uri
-
-    elif node_type == "app.bsky.feed.defs#blockedPost":
-        logger.debug("Encountered blocked post in thread")
-        return None
+        get = node.get
+        node_type = get("$type")
 
-    elif node_type == "app.bsky.feed.defs#notFoundPost":
-        logger.debug("Encountered not found post in thread")
-        return None
+        if node_type == "app.bsky.feed.defs#threadViewPost":
+            post_data = get("post")
+            if not post_data:
+                continue
 
-    else:
-        logger.warning(f"Unknown thread node type: {node_type}")
-        return None
+            post = _normalize_post(post_data, clock)
+            if not post:
+                continue
+
+            # Children are only pushed once their node is kept, so the
+            # first post kept is the starting node
+            if root_uri is None:
+                root_uri = post.uri
+
+            posts[post.uri] = post
+
+            if parent_uri:
+                key = (post.uri, parent_uri, "REPLY")
+                if key not in seen_edges:
+                    seen_edges.add(key)
+                    edges.append(
+                        Edge(
+                            src_uri=post.uri,
+                            dst_uri=parent_uri,
+                            edge_type="REPLY",
+                            created_at=post.created_at,
+                        )
+                    )
+
+            for reply_node in reversed(get("replies", [])):
+                push((reply_node, post.uri, depth + 1))
+
+            parent_node = get("parent")
+            if parent_node:
+                push((parent_node, post.uri, depth + 1))
+
+        elif node_type == "app.bsky.feed.defs#blockedPost":
+            logger.debug("Encountered blocked post in thread")
+
+        elif node_type == "app.bsky.feed.defs#notFoundPost":
+            logger.debug("Encountered not found post in thread")
+
+        else:
+            logger.warning(f"Unknown thread node type: {node_type}")
+
+    return root_uri
 
 
 def extract_thread_posts_and_edges(
@@ -161,47 +242,29 @@ def extract_quote_edges(
     quote_posts: list[dict[str, Any]],
     target_uri: str,
 ) -> tuple[list[Post], list[Edge]]:
-    posts: list[Post] = []
-    edges: list[Edge] = []
-
-    for post_data in quote_posts:
-        post = normalize_post(post_data)
-        if not post:
-            continue
-
-        posts.append(post)
+    target_uri = sys.intern(target_uri)
 
-        edge = Edge(
+    # Drop repeated posts as they're collected; each remaining post then
+    # yields exactly one distinct edge
+    posts = list(dict.fromkeys(normalize_posts(quote_posts)))
+    edges = [
+        Edge(
             src_uri=post.uri,
             dst_uri=target_uri,
             edge_type="QUOTE",
             created_at=post.created_at,
         )
-        edges.append(edge)
+        for post in posts
+    ]
 
     return posts, edges
 
 
 def deduplicate_posts(posts: list[Post]) -> list[Post]:
-    seen = set()
-    deduped = []
-
-    for post in posts:
-        if post.uri not in seen:
-            seen.add(post.uri)
-            deduped.append(post)
-
-    return deduped
+    # Post hashes and compares by uri; dict keys keep the first copy
+    return list(dict.fromkeys(posts))
 
 
 def deduplicate_edges(edges: list[Edge]) -> list[Edge]:
-    seen = set()
-    deduped = []
-
-    for edge in edges:
-        key = (edge.src_uri, edge.dst_uri, edge.edge_type)
-        if key not in seen:
-            seen.add(key)
-            deduped.append(edge)
-
-    return deduped
+    # Edge hashes and compares by (src_uri, dst_uri, edge_type)
+    return list(dict.fromkeys(edges))
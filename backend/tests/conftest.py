@@ -5,28 +5,46 @@ from typing import Generator
 import pytest
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.db.models import Base
 
-# Use in-memory SQLite for tests
+# Use in-memory SQLite for tests; each pytest-xdist worker is its own
+# process, so `pytest -n auto` gives every worker a private database
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
+# Optional Postgres database for dialect-specific tests; they are skipped
+# when unset. Its tables are created and dropped by the test session.
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
 
-@pytest.fixture(scope="function")
+
+@pytest.fixture(scope="session")
 def engine():
-    """Create a test database engine."""
+    """Create a test database engine and schema, shared by all tests."""
     engine = create_engine(
         TEST_DATABASE_URL,
         connect_args={"check_same_thread": False},
+        # One connection, so every test sees the same in-memory database
+        poolclass=StaticPool,
         echo=False,
     )
     
-    # Enable foreign keys for SQLite
+    # Enable foreign keys for SQLite and skip durability work the in-memory
+    # database doesn't need; let SQLAlchemy emit BEGIN itself so SAVEPOINTs
+    # work with pysqlite
     @event.listens_for(engine, "connect")
     def set_sqlite_pragma(dbapi_conn, connection_record):
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
+        dbapi_conn.isolation_level = None
+        dbapi_conn.executescript(
+            "PRAGMA foreign_keys=ON;"
+            "PRAGMA synchronous=OFF;"
+            "PRAGMA journal_mode=MEMORY;"
+            "PRAGMA temp_store=MEMORY;"
+        )
+    
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
     
     Base.metadata.create_all(bind=engine)
     yield engine
@@ -34,13 +52,71 @@ def engine():
     engine.dispose()
 
 
+@pytest.fixture(scope="session")
+def pg_engine():
+    """Create a Postgres engine configured like the app's, with small pages."""
+    if not TEST_POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    
+    # Small pages so executemany batches span several round-trips
+    engine = create_engine(
+        TEST_POSTGRES_URL,
+        executemany_mode="values_plus_batch",
+        insertmanyvalues_page_size=5,
+        executemany_batch_page_size=5,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
 @pytest.fixture(scope="function")
 def session(engine) -> Generator[Session, None, None]:
-    """Create a test database session."""
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    """Create a test database session.
+    
+    The session runs inside a transaction that is rolled back after the
+    test; its commits only release SAVEPOINTs, so tests stay isolated
+    without recreating the schema.
+    """
+    yield from _transactional_session(engine)
+
+
+@pytest.fixture(scope="function")
+def pg_session(pg_engine) -> Generator[Session, None, None]:
+    """Create a rolled-back Postgres session, like `session`."""
+    yield from _transactional_session(pg_engine)
+
+
+def _transactional_session(engine) -> Generator[Session, None, None]:
+    """Yield a session whose work is rolled back afterwards."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    SessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+    )
     session = SessionLocal()
     try:
         yield session
     finally:
-        session.rollback()
         session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="function")
+def statements(engine) -> Generator[list[str], None, None]:
+    """Collect the SQL statements sent to the database during a test."""
+    executed: list[str] = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield executed
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,127 @@
+"""Tests for the runs API routes."""
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db import get_session
+from app.main import app
+from app.repositories import runs_repository as repo
+from bsky.models import Edge, Post, PostMetrics
+
+NDJSON = {"Accept": "application/x-ndjson"}
+CREATED_AT = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def client(session: Session):
+    """API client whose requests use the test session."""
+    app.dependency_overrides[get_session] = lambda: session
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def run_id(session: Session) -> uuid.UUID:
+    """A stored seed run: a <- b, a <- c, b <- c, ranked a > b > c."""
+    posts = [
+        Post(
+            uri=f"at://{name}",
+            author_did="did:plc:123",
+            author_handle="user.bsky.social",
+            created_at=CREATED_AT + timedelta(hours=i),
+            text=name,
+            metrics=PostMetrics(like_count=likes),
+        )
+        for i, (name, likes) in enumerate((("a", 10), ("b", 5), ("c", 1)))
+    ]
+    edges = [
+        Edge(src_uri="at://b", dst_uri="at://a", edge_type="REPLY"),
+        Edge(src_uri="at://c", dst_uri="at://a", edge_type="QUOTE"),
+        Edge(src_uri="at://c", dst_uri="at://b", edge_type="REPLY"),
+    ]
+    run_id = repo.persist_run(
+        session,
+        mode="seed",
+        query=None,
+        seed_uri="at://a",
+        params_json={},
+        posts=posts,
+        edges=edges,
+    )
+    session.commit()
+    return run_id
+
+
+def read_ndjson(response) -> list[tuple[str, dict]]:
+    """Split an NDJSON body into (kind, payload) pairs, checking framing."""
+    assert response.headers["content-type"] == "application/x-ndjson"
+    body = response.text
+    assert body.endswith("\n")
+    lines = []
+    for line in body.split("\n")[:-1]:
+        (kind, payload), = json.loads(line).items()
+        lines.append((kind, payload))
+    return lines
+
+
+class TestGraphNdjson:
+    """Tests for streaming a run's graph as NDJSON."""
+
+    def test_full_graph(self, client, run_id):
+        response = client.get(f"/runs/{run_id}/graph", headers=NDJSON)
+        assert response.status_code == 200
+        lines = read_ndjson(response)
+
+        # Nodes, then edges, then a single closing stats line
+        kinds = [kind for kind, _ in lines]
+        assert kinds == ["node"] * 3 + ["edge"] * 3 + ["stats"]
+
+        nodes = {payload["uri"]: payload for kind, payload in lines if kind == "node"}
+        assert set(nodes) == {"at://a", "at://b", "at://c"}
+        assert (nodes["at://a"]["inDegree"], nodes["at://a"]["outDegree"]) == (2, 0)
+        assert (nodes["at://c"]["inDegree"], nodes["at://c"]["outDegree"]) == (0, 2)
+
+        edges = {(p["src"], p["dst"], p["type"]) for kind, p in lines if kind == "edge"}
+        assert edges == {
+            ("at://b", "at://a", "REPLY"),
+            ("at://c", "at://a", "QUOTE"),
+            ("at://c", "at://b", "REPLY"),
+        }
+
+        stats = lines[-1][1]
+        assert (stats["nodeCount"], stats["edgeCount"]) == (3, 3)
+        assert stats["timeMin"].startswith("2025-01-01T12:00:00")
+        assert stats["timeMax"].startswith("2025-01-01T14:00:00")
+
+        # Same graph as the JSON response
+        graph = client.get(f"/runs/{run_id}/graph").json()
+        assert graph["stats"] == stats
+        assert {node["uri"]: node for node in graph["nodes"]} == nodes
+
+    def test_max_nodes(self, client, run_id):
+        response = client.get(
+            f"/runs/{run_id}/graph", params={"max_nodes": 2}, headers=NDJSON
+        )
+        assert response.status_code == 200
+        lines = read_ndjson(response)
+
+        assert [kind for kind, _ in lines] == ["node", "node", "edge", "stats"]
+        # Top nodes by engagement, in rank order, with degrees inside the set
+        assert [(p["uri"], p["inDegree"], p["outDegree"]) for _, p in lines[:2]] == [
+            ("at://a", 1, 0),
+            ("at://b", 0, 1),
+        ]
+        assert lines[2][1] == {"src": "at://b", "dst": "at://a", "type": "REPLY"}
+        assert (lines[3][1]["nodeCount"], lines[3][1]["edgeCount"]) == (2, 1)
+
+    def test_unknown_run_is_404_before_streaming(self, client):
+        response = client.get(f"/runs/{uuid.uuid4()}/graph", headers=NDJSON)
+        assert response.status_code == 404
+        assert response.headers["content-type"] == "application/json"
+        assert "not found" in response.json()["detail"]
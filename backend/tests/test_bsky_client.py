@@ -0,0 +1,236 @@
+"""
+Unit tests for the Bluesky API client.
+"""
+
+import asyncio
+
+import fakeredis
+import orjson
+import pytest
+
+from bsky.client import BlueskyClient, _shared_pools, close_shared_clients, get_shared_client
+from bsky.models import IngestConfig
+
+
+@pytest.fixture
+def client():
+    return BlueskyClient(IngestConfig(redis_enabled=False))
+
+
+class TestMakeCacheKey:
+    """Tests for cache key construction."""
+
+    def test_stable_across_param_order(self, client):
+        a = client._make_cache_key("app.bsky.feed.searchPosts", {"q": "x", "limit": 25})
+        b = client._make_cache_key("app.bsky.feed.searchPosts", {"limit": 25, "q": "x"})
+        assert a == b
+        assert a.startswith("bsky:app.bsky.feed.searchPosts:")
+
+    def test_distinguishes_params(self, client):
+        endpoint = "app.bsky.feed.searchPosts"
+        assert client._make_cache_key(endpoint, {"q": "x"}) != client._make_cache_key(endpoint, {"q": "y"})
+        assert client._make_cache_key(endpoint, {"limit": 25}) != client._make_cache_key(endpoint, {"limit": "25"})
+        # Separators inside values can't alias other params
+        assert client._make_cache_key(endpoint, {"a": "1;b=2"}) != client._make_cache_key(endpoint, {"a": "1", "b": "2"})
+
+    def test_list_params(self, client):
+        endpoint = "app.bsky.feed.getPosts"
+        a = client._make_cache_key(endpoint, {"uris": ["at://a", "at://b"]})
+        b = client._make_cache_key(endpoint, {"uris": ["at://a", "at://b"]})
+        c = client._make_cache_key(endpoint, {"uris": ["at://b", "at://a"]})
+        assert a == b
+        assert a != c
+
+    def test_distinguishes_endpoints(self, client):
+        params = {"uri": "at://a"}
+        assert client._make_cache_key("app.bsky.feed.getQuotes", params) != client._make_cache_key(
+            "app.bsky.feed.getPostThread", params
+        )
+
+
+class TestEndpointTTL:
+    """Tests for per-endpoint cache TTLs."""
+
+    def test_known_endpoints(self):
+        config = IngestConfig(redis_enabled=False, search_ttl=1, thread_ttl=2, posts_ttl=3)
+        client = BlueskyClient(config)
+        assert client._get_ttl_for_endpoint("app.bsky.feed.searchPosts") == 1
+        assert client._get_ttl_for_endpoint("app.bsky.feed.getPostThread") == 2
+        assert client._get_ttl_for_endpoint("app.bsky.feed.getQuotes") == 2
+        assert client._get_ttl_for_endpoint("app.bsky.feed.getPosts") == 3
+
+    def test_unknown_endpoint_uses_search_ttl(self, client):
+        assert client._get_ttl_for_endpoint("app.bsky.actor.getProfile") == client.config.search_ttl
+
+
+@pytest.fixture
+def close_shared():
+    """Close the pools get_shared_client opened, so they don't leak."""
+    yield
+    asyncio.run(close_shared_clients())
+
+
+@pytest.mark.usefixtures("close_shared")
+class TestSharedClient:
+    """Tests for clients sharing connections across runs."""
+
+    def test_reuses_pool_per_config(self):
+        a = get_shared_client(IngestConfig(redis_enabled=False))
+        b = get_shared_client(IngestConfig(redis_enabled=False, max_requests_per_run=10))
+        c = get_shared_client(IngestConfig(redis_enabled=False, read_timeout=1.0))
+        d = get_shared_client(IngestConfig(redis_enabled=False, cache_key_filter=True))
+        assert a._pool is b._pool
+        assert a._pool is not c._pool
+        assert a._pool is not d._pool
+        assert d._pool.config.cache_key_filter
+        assert len(_shared_pools) == 3
+
+    def test_budget_and_stats_are_per_client(self):
+        a = get_shared_client(IngestConfig(redis_enabled=False))
+        b = get_shared_client(IngestConfig(redis_enabled=False, max_requests_per_run=10))
+        a._request_count = 5
+        a.stats.cache_hits = 1
+        assert b.get_remaining_budget() == 10
+        assert b.stats.cache_hits == 0
+
+
+def make_cached_client(**config) -> BlueskyClient:
+    """Client backed by an in-process fake Redis, with HTTP stubbed out."""
+    client = BlueskyClient(IngestConfig(redis_enabled=False, **config))
+    client._pool.redis = fakeredis.FakeAsyncRedis()
+    client.fetched = []
+
+    async def fetch(endpoint, params):
+        client.fetched.append(params["q"])
+        await asyncio.sleep(0)
+        return {"q": params["q"]}
+
+    client._fetch = fetch
+    return client
+
+
+@pytest.fixture
+def cached_client():
+    return make_cached_client()
+
+
+class TestGetMany:
+    """Tests for batched requests with cache access."""
+
+    @pytest.mark.asyncio
+    async def test_partial_cache_hits(self, cached_client):
+        endpoint = "app.bsky.feed.searchPosts"
+        params_list = [{"q": str(i)} for i in range(4)]
+        redis = cached_client._pool.redis
+        for params in params_list[:2]:
+            key = cached_client._make_cache_key(endpoint, params)
+            await redis.set(key, orjson.dumps({"q": params["q"], "cached": True}))
+
+        results = await cached_client.get_many(endpoint, params_list)
+
+        assert results == [
+            {"q": "0", "cached": True},
+            {"q": "1", "cached": True},
+            {"q": "2"},
+            {"q": "3"},
+        ]
+        assert cached_client.fetched == ["2", "3"]
+        assert cached_client.stats.cache_hits == 2
+        assert cached_client.stats.cache_misses == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, cached_client):
+        in_flight = 0
+        peak = 0
+
+        async def fetch(endpoint, params):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"q": params["q"]}
+
+        cached_client._fetch = fetch
+        params_list = [{"q": str(i)} for i in range(10)]
+        results = await cached_client.get_many(
+            "app.bsky.feed.searchPosts", params_list, max_concurrency=3
+        )
+
+        assert results == params_list
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_writes_back_misses_in_one_pipeline(self, cached_client):
+        endpoint = "app.bsky.feed.getPosts"
+        redis = cached_client._pool.redis
+        pipelines = []
+        pipeline = redis.pipeline
+
+        def counting_pipeline(*args, **kwargs):
+            pipelines.append(kwargs)
+            return pipeline(*args, **kwargs)
+
+        redis.pipeline = counting_pipeline
+        params_list = [{"q": str(i)} for i in range(3)]
+        await cached_client.get_many(endpoint, params_list)
+
+        assert pipelines == [{"transaction": False}]
+        for params in params_list:
+            key = cached_client._make_cache_key(endpoint, params)
+            assert orjson.loads(await redis.get(key)) == params
+            assert 0 < await redis.ttl(key) <= cached_client.config.posts_ttl
+
+        # A second batch is served entirely from the cache
+        cached_client.fetched.clear()
+        assert await cached_client.get_many(endpoint, params_list) == params_list
+        assert cached_client.fetched == []
+
+
+class TestCacheKeyFilter:
+    """Tests for the optional Bloom filter of cached keys."""
+
+    ENDPOINT = "app.bsky.feed.searchPosts"
+
+    async def _cache_externally(self, client, q):
+        """Write an entry as another process sharing the Redis would."""
+        key = client._make_cache_key(self.ENDPOINT, {"q": q})
+        await client._pool.redis.set(key, orjson.dumps({"q": q, "cached": True}))
+
+    @pytest.mark.asyncio
+    async def test_off_by_default_sees_external_writes(self, cached_client):
+        assert await cached_client.get(self.ENDPOINT, {"q": "a"}) == {"q": "a"}
+        assert cached_client._pool.cached_keys is None
+
+        # Written after startup, still a hit
+        await self._cache_externally(cached_client, "b")
+        assert await cached_client.get(self.ENDPOINT, {"q": "b"}) == {"q": "b", "cached": True}
+        assert cached_client.fetched == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_on_seeds_from_redis_and_skips_unknown_keys(self):
+        client = make_cached_client(cache_key_filter=True)
+        await self._cache_externally(client, "a")
+
+        # Cached before startup: seeded into the filter, so a hit
+        assert await client.get(self.ENDPOINT, {"q": "a"}) == {"q": "a", "cached": True}
+        assert client._pool.cached_keys is not None
+
+        # Cached by this process: a hit
+        assert await client.get(self.ENDPOINT, {"q": "b"}) == {"q": "b"}
+        assert await client.get(self.ENDPOINT, {"q": "b"}) == {"q": "b"}
+
+        # Cached elsewhere after startup: unknown to the filter, so fetched
+        await self._cache_externally(client, "c")
+        assert await client.get(self.ENDPOINT, {"q": "c"}) == {"q": "c"}
+        assert client.fetched == ["b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_on_disabled_when_scan_exceeds_capacity(self):
+        client = make_cached_client(cache_key_filter=True)
+        client._pool.CACHED_KEYS_CAPACITY = 2
+        for q in "abc":
+            await self._cache_externally(client, q)
+
+        assert await client.get(self.ENDPOINT, {"q": "a"}) == {"q": "a", "cached": True}
+        assert client._pool.cached_keys is None
@@ -0,0 +1,158 @@
+"""
+Unit tests for the ingestion modes.
+"""
+
+import threading
+
+import pytest
+
+from bsky import ingest
+from bsky.client import BlueskyClient
+from bsky.models import IngestConfig, QueryModeInputs, SeedModeInputs
+
+SEED_URI = "at://did:plc:root/app.bsky.feed.post/root"
+
+
+def raw_post(name: str) -> dict:
+    return {
+        "uri": f"at://did:plc:{name}/app.bsky.feed.post/{name}",
+        "author": {"did": f"did:plc:{name}", "handle": f"{name}.bsky.social"},
+        "record": {"text": name, "createdAt": "2024-01-15T10:00:00.000Z"},
+    }
+
+
+def thread_node(name: str, replies=()) -> dict:
+    return {
+        "$type": "app.bsky.feed.defs#threadViewPost",
+        "post": raw_post(name),
+        "replies": list(replies),
+    }
+
+
+def make_stub_client(responses: dict[str, list]) -> BlueskyClient:
+    """Client with HTTP stubbed out, serving canned responses per endpoint.
+
+    Each request takes the next response queued for its endpoint; queued
+    exceptions are raised instead.
+    """
+    client = BlueskyClient(IngestConfig(redis_enabled=False))
+    client.fetched = []
+
+    async def fetch(endpoint, params):
+        client.fetched.append((endpoint, threading.current_thread().name))
+        client.stats.total_requests += 1
+        response = responses[endpoint].pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    client._fetch = fetch
+    return client
+
+
+@pytest.fixture(autouse=True)
+def stop_ingest_loop():
+    yield
+    ingest.shutdown()
+
+
+class TestIngestLoop:
+    """Tests for running ingestion on the long-lived event loop."""
+
+    def test_modes_share_loop_until_shutdown(self):
+        client = make_stub_client({
+            "app.bsky.feed.searchPosts": [{"posts": [raw_post("a"), raw_post("b")]}],
+            "app.bsky.feed.getPostThread": [{"thread": thread_node("root")}],
+            "app.bsky.feed.getQuotes": [{"posts": [raw_post("q")]}],
+        })
+
+        result = ingest.query_mode(QueryModeInputs(query="x"), client=client)
+        assert [post.uri for post in result.posts] == [
+            raw_post("a")["uri"],
+            raw_post("b")["uri"],
+        ]
+        assert result.total_requests == 1
+
+        loop = ingest._loop
+        assert loop is not None and loop.is_running()
+
+        result = ingest.seed_mode(SeedModeInputs(seed_uri=SEED_URI), client=client)
+        assert ingest._loop is loop
+        assert len(result.posts) == 2
+        # Stats start over for each run
+        assert result.total_requests == 2
+        assert {thread for _, thread in client.fetched} == {"bsky-ingest"}
+
+        ingest.shutdown()
+        ingest.shutdown()
+        assert ingest._loop is None
+        for thread in threading.enumerate():
+            if thread.name == "bsky-ingest":
+                thread.join(timeout=5)
+        assert not loop.is_running()
+
+        # The next run starts a fresh loop
+        client = make_stub_client({
+            "app.bsky.feed.searchPosts": [{"posts": [raw_post("c")]}],
+        })
+        result = ingest.query_mode(QueryModeInputs(query="x"), client=client)
+        assert [post.uri for post in result.posts] == [raw_post("c")["uri"]]
+        assert ingest._loop is not None and ingest._loop is not loop
+
+
+def uris(posts) -> list[str]:
+    return [post.uri for post in posts]
+
+
+class TestSeedMode:
+    """Tests for fetching the seed thread and its quotes concurrently."""
+
+    def test_thread_failure_still_pages_quotes(self):
+        client = make_stub_client({
+            "app.bsky.feed.getPostThread": [RuntimeError("thread down")],
+            "app.bsky.feed.getQuotes": [
+                {"posts": [raw_post("q1")], "cursor": "next"},
+                {"posts": [raw_post("q2")]},
+            ],
+        })
+
+        result = ingest.seed_mode(SeedModeInputs(seed_uri=SEED_URI), client=client)
+
+        assert uris(result.posts) == [raw_post("q1")["uri"], raw_post("q2")["uri"]]
+        assert [(edge.src_uri, edge.dst_uri, edge.edge_type) for edge in result.edges] == [
+            (raw_post("q1")["uri"], SEED_URI, "QUOTE"),
+            (raw_post("q2")["uri"], SEED_URI, "QUOTE"),
+        ]
+
+    def test_quote_failure_keeps_thread(self):
+        client = make_stub_client({
+            "app.bsky.feed.getPostThread": [
+                {"thread": thread_node("root", [thread_node("reply")])}
+            ],
+            "app.bsky.feed.getQuotes": [RuntimeError("quotes down")],
+        })
+
+        result = ingest.seed_mode(SeedModeInputs(seed_uri=SEED_URI), client=client)
+
+        assert uris(result.posts) == [SEED_URI, raw_post("reply")["uri"]]
+        assert [(edge.src_uri, edge.dst_uri, edge.edge_type) for edge in result.edges] == [
+            (raw_post("reply")["uri"], SEED_URI, "REPLY"),
+        ]
+
+    def test_max_nodes_reached_after_thread(self):
+        client = make_stub_client({
+            "app.bsky.feed.getPostThread": [
+                {"thread": thread_node("root", [thread_node("reply")])}
+            ],
+            "app.bsky.feed.getQuotes": [{"posts": [raw_post("q1")], "cursor": "next"}],
+        })
+
+        result = ingest.seed_mode(
+            SeedModeInputs(seed_uri=SEED_URI, max_nodes=1),
+            client=client,
+        )
+
+        assert uris(result.posts) == [SEED_URI]
+        assert [edge.edge_type for edge in result.edges] == ["REPLY"]
+        # The first quote page was already in flight; no further pages follow
+        assert [endpoint for endpoint, _ in client.fetched].count("app.bsky.feed.getQuotes") == 1
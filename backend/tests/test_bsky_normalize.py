@@ -8,6 +8,7 @@ from datetime import datetime
 from bsky.models import Post, PostMetrics, Edge
 from bsky.normalize import (
     normalize_post,
+    normalize_posts,
     parse_timestamp,
     extract_quote_edges,
     deduplicate_posts,
@@ -146,6 +147,41 @@ class TestNormalizePost:
         post = normalize_post(raw_post)
         assert post is None
 
+    def test_normalize_posts_skips_invalid(self):
+        """Test batch normalization keeps valid posts in order."""
+        author = {"did": "did:plc:xyz", "handle": "alice.bsky.social"}
+        record = {"text": "Test", "createdAt": "2024-01-15T10:30:45.123Z"}
+        raw_posts = [
+            {"uri": "at://did:plc:xyz/app.bsky.feed.post/1", "author": author, "record": record},
+            {"author": author, "record": record},
+            {"uri": "at://did:plc:xyz/app.bsky.feed.post/2", "record": record},
+            {"uri": "at://did:plc:xyz/app.bsky.feed.post/3", "author": author, "record": record, "likeCount": 4},
+        ]
+
+        posts = normalize_posts(raw_posts)
+
+        assert [post.uri for post in posts] == [
+            "at://did:plc:xyz/app.bsky.feed.post/1",
+            "at://did:plc:xyz/app.bsky.feed.post/3",
+        ]
+        assert posts[1].metrics == PostMetrics(like_count=4)
+
+    def test_normalize_posts_shares_fallback_time(self):
+        """Test that posts without timestamps in one batch get one fallback time."""
+        author = {"did": "did:plc:xyz", "handle": "alice.bsky.social"}
+        raw_posts = [
+            {"uri": f"at://did:plc:xyz/app.bsky.feed.post/{i}", "author": author, "record": {}}
+            for i in range(2)
+        ]
+
+        posts = normalize_posts(raw_posts)
+
+        assert len(posts) == 2
+        assert posts[0].created_at is posts[1].created_at
+
+        now = datetime(2024, 1, 15, 10, 0, 0)
+        assert [post.created_at for post in normalize_posts(raw_posts, now)] == [now, now]
+
 
 class TestExtractQuoteEdges:
     """Tests for quote edge extraction."""
@@ -358,6 +394,64 @@ class TestNormalizeThreadNode:
         assert len(posts) == 1
         assert len(edges) == 0
 
+    def test_normalize_thread_with_duplicate_reply(self):
+        """Test that a reply listed twice yields a single edge."""
+        reply = {
+            "$type": "app.bsky.feed.defs#threadViewPost",
+            "post": {
+                "uri": "at://did:plc:reply/app.bsky.feed.post/reply1",
+                "author": {
+                    "did": "did:plc:reply",
+                    "handle": "replier.bsky.social",
+                },
+                "record": {
+                    "text": "Reply 1",
+                    "createdAt": "2024-01-15T10:05:00.000Z",
+                },
+            },
+        }
+        thread_node = {
+            "$type": "app.bsky.feed.defs#threadViewPost",
+            "post": {
+                "uri": "at://did:plc:root/app.bsky.feed.post/root",
+                "author": {
+                    "did": "did:plc:root",
+                    "handle": "root.bsky.social",
+                },
+                "record": {
+                    "text": "Root post",
+                    "createdAt": "2024-01-15T10:00:00.000Z",
+                },
+            },
+            "replies": [reply, reply],
+        }
+
+        posts = {}
+        edges = []
+        normalize_thread_node(thread_node, posts, edges)
+
+        assert len(posts) == 2
+        assert len(edges) == 1
+
+    def test_normalize_thread_shares_fallback_time(self):
+        """Test that posts without timestamps in one thread get one fallback time."""
+        def node(name, replies=()):
+            return {
+                "$type": "app.bsky.feed.defs#threadViewPost",
+                "post": {
+                    "uri": f"at://did:plc:xyz/app.bsky.feed.post/{name}",
+                    "author": {"did": "did:plc:xyz", "handle": "alice.bsky.social"},
+                    "record": {"text": name},
+                },
+                "replies": list(replies),
+            }
+
+        posts = {}
+        normalize_thread_node(node("root", [node("reply")]), posts, [])
+
+        root, reply = posts.values()
+        assert root.created_at is reply.created_at
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
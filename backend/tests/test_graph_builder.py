@@ -2,9 +2,12 @@
 from datetime import datetime, timezone
 
 import pytest
+from sqlalchemy.orm import Session
 
 from app.db.models import Post
-from app.services.runs_service import _build_graph
+from app.repositories import runs_repository as repo
+from app.services.runs_service import _build_graph, get_run_graph
+from bsky.models import Edge
 
 
 def test_graph_builder_basic():
@@ -54,7 +57,7 @@ def test_graph_builder_basic():
     ]
     
     # Build graph
-    graph = _build_graph(posts, edges, max_nodes=None)
+    graph = _build_graph(posts, edges)
     
     # Verify node count
     assert graph.stats.node_count == 3
@@ -78,7 +81,7 @@ def test_graph_builder_basic():
     assert graph.stats.time_max == datetime(2025, 1, 1, 14, 0, 0, tzinfo=timezone.utc)
 
 
-def test_graph_builder_max_nodes_filtering():
+def test_graph_builder_max_nodes_filtering(session: Session):
     """Test that max_nodes filtering works correctly."""
     # Create test posts with varying engagement
     posts = [
@@ -119,13 +122,20 @@ def test_graph_builder_max_nodes_filtering():
     
     # Create edges between all posts
     edges = [
-        ("post2", "post1", "QUOTE", None),
-        ("post3", "post1", "QUOTE", None),
-        ("post3", "post2", "REPLY", None),
+        Edge(src_uri="post2", dst_uri="post1", edge_type="QUOTE"),
+        Edge(src_uri="post3", dst_uri="post1", edge_type="QUOTE"),
+        Edge(src_uri="post3", dst_uri="post2", edge_type="REPLY"),
     ]
     
+    # The node limit is applied in the database, so go through a stored run
+    session.add_all(posts)
+    run_id = repo.create_run(session, mode="seed", query=None, seed_uri="post1", params_json={})
+    repo.link_run_posts(session, run_id, [post.uri for post in posts])
+    repo.link_run_edges(session, run_id, edges)
+    session.commit()
+    
     # Build graph with max_nodes=2
-    graph = _build_graph(posts, edges, max_nodes=2)
+    graph = get_run_graph(session, run_id, max_nodes=2)
     
     # Should keep post1 and post2 (highest engagement)
     assert graph.stats.node_count == 2
@@ -175,7 +185,7 @@ def test_graph_builder_isolated_nodes():
     
     edges = []  # No edges
     
-    graph = _build_graph(posts, edges, max_nodes=None)
+    graph = _build_graph(posts, edges)
     
     assert graph.stats.node_count == 2
     assert graph.stats.edge_count == 0
@@ -220,7 +230,7 @@ def test_graph_builder_edge_filtering():
         ("post_external", "post2", "QUOTE", None),  # Should be filtered
     ]
     
-    graph = _build_graph(posts, edges, max_nodes=None)
+    graph = _build_graph(posts, edges)
     
     # Only 1 edge should remain
     assert graph.stats.edge_count == 1
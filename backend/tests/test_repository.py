@@ -1,12 +1,28 @@
 """Tests for repository layer."""
-import uuid
-from datetime import datetime, timezone
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlalchemy import insert, select, text
 from sqlalchemy.orm import Session
 
+from app.db.models import Post as DBPost
+from app.db.models import Edge as DBEdge
+from app.db.models import Run, RunPost
 from app.repositories import runs_repository as repo
 from bsky.models import Edge, Post, PostMetrics
+from bsky.normalize import deduplicate_edges
+
+# Shared timestamp for fixture rows; others are offsets from it
+CREATED_AT = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+# Built once and reused; executions hit the engine's compiled-statement cache
+ALL_POSTS = select(DBPost)
+
+
+def seed_posts(session: Session, rows: list[dict]):
+    """Insert setup-only post rows directly, bypassing the upsert path."""
+    session.execute(insert(DBPost), rows)
 
 
 def test_upsert_posts_idempotency(session: Session):
@@ -18,18 +34,18 @@ def test_upsert_posts_idempotency(session: Session):
             cid="cid123",
             author_did="did:plc:123",
             author_handle="user1.bsky.social",
-            created_at=datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            created_at=CREATED_AT,
             text="First post",
-            metrics=PostMetrics(like_count=10, repost_count=5, reply_count=2, quote_count=1),
+            metrics=PostMetrics(like_count=10),
         ),
         Post(
             uri="at://did:plc:456/app.bsky.feed.post/def",
             cid="cid456",
             author_did="did:plc:456",
             author_handle="user2.bsky.social",
-            created_at=datetime(2025, 1, 1, 13, 0, 0, tzinfo=timezone.utc),
+            created_at=CREATED_AT + timedelta(hours=1),
             text="Second post",
-            metrics=PostMetrics(like_count=20, repost_count=10, reply_count=4, quote_count=2),
+            metrics=PostMetrics(like_count=20),
         ),
     ]
     
@@ -38,28 +54,18 @@ def test_upsert_posts_idempotency(session: Session):
     session.commit()
     assert count1 == 2
     
-    # Verify posts are in database
-    db_posts = repo.get_run_posts(session, uuid.uuid4())  # No run, but posts exist
-    # Note: Without a run link, we can't fetch via get_run_posts
-    # Let's verify by checking the table directly
-    from app.db.models import Post as DBPost
-    from sqlalchemy import select
-    
-    stmt = select(DBPost)
-    result = session.execute(stmt)
-    all_posts = list(result.scalars().all())
+    # Verify posts are in database. Without a run link they can't be
+    # fetched via get_run_posts, so check the table directly
+    all_posts = session.execute(ALL_POSTS).scalars().all()
     assert len(all_posts) == 2
     
     # Update one post
     updated_posts = [
-        Post(
-            uri="at://did:plc:123/app.bsky.feed.post/abc",
+        replace(
+            posts[0],
             cid="cid123_new",
-            author_did="did:plc:123",
-            author_handle="user1.bsky.social",
-            created_at=datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
             text="First post updated",
-            metrics=PostMetrics(like_count=15, repost_count=6, reply_count=3, quote_count=1),
+            metrics=PostMetrics(like_count=15),
         ),
     ]
     
@@ -69,15 +75,14 @@ def test_upsert_posts_idempotency(session: Session):
     assert count2 == 1
     
     # Verify still only 2 posts total
-    stmt = select(DBPost)
-    result = session.execute(stmt)
-    all_posts = list(result.scalars().all())
+    all_posts = session.execute(ALL_POSTS).scalars().all()
     assert len(all_posts) == 2
     
     # Verify the post was updated
-    stmt = select(DBPost).where(DBPost.uri == "at://did:plc:123/app.bsky.feed.post/abc")
-    result = session.execute(stmt)
-    updated_post = result.scalar_one()
+    updated_post = next(
+        post for post in all_posts
+        if post.uri == "at://did:plc:123/app.bsky.feed.post/abc"
+    )
     assert updated_post.text == "First post updated"
     assert updated_post.like_count == 15
     assert updated_post.cid == "cid123_new"
@@ -86,41 +91,30 @@ def test_upsert_posts_idempotency(session: Session):
 def test_run_linking(session: Session):
     """Test that the same post can be linked to multiple runs."""
     # Create a post
-    posts = [
-        Post(
-            uri="at://did:plc:123/app.bsky.feed.post/shared",
-            cid="cid_shared",
-            author_did="did:plc:123",
-            author_handle="user.bsky.social",
-            created_at=datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
-            text="Shared post",
-            metrics=PostMetrics(like_count=10),
-        ),
-    ]
+    seed_posts(session, [
+        {
+            "uri": "at://did:plc:123/app.bsky.feed.post/shared",
+            "cid": "cid_shared",
+            "author_did": "did:plc:123",
+            "author_handle": "user.bsky.social",
+            "created_at": CREATED_AT,
+            "text": "Shared post",
+            "like_count": 10,
+        },
+    ])
     
-    # Upsert post
-    repo.upsert_posts(session, posts)
-    
-    # Create two runs
-    run_id_1 = repo.create_run(
-        session,
-        mode="query",
-        query="test query 1",
-        seed_uri=None,
-        params_json={},
-    )
-    run_id_2 = repo.create_run(
-        session,
-        mode="query",
-        query="test query 2",
-        seed_uri=None,
-        params_json={},
-    )
+    # Create two runs in one statement; create_run is covered elsewhere
+    run_id_1, run_id_2 = session.execute(
+        insert(Run).returning(Run.run_id, sort_by_parameter_order=True),
+        [
+            {"mode": "query", "query": "test query 1", "params_json": {}},
+            {"mode": "query", "query": "test query 2", "params_json": {}},
+        ],
+    ).scalars().all()
     
     # Link the same post to both runs
     uris = ["at://did:plc:123/app.bsky.feed.post/shared"]
-    repo.link_run_posts(session, run_id_1, uris)
-    repo.link_run_posts(session, run_id_2, uris)
+    assert repo.link_run_posts_many(session, [(run_id_1, uris), (run_id_2, uris)]) == 2
     session.commit()
     
     # Verify both runs have the post
@@ -133,49 +127,365 @@ def test_run_linking(session: Session):
     assert posts_run_2[0].uri == uris[0]
     
     # Verify run_posts table has correct counts
-    from app.db.models import RunPost
-    from sqlalchemy import select, func
-    
-    stmt = select(func.count()).select_from(RunPost)
-    result = session.execute(stmt)
-    total_links = result.scalar()
+    total_links = session.execute(text("SELECT COUNT(*) FROM run_posts")).scalar()
     assert total_links == 2
 
 
-def test_edge_deduplication(session: Session):
-    """Test that edges are deduplicated correctly."""
+@pytest.mark.parametrize("pre_deduplicated", [False, True])
+def test_edge_deduplication(session: Session, statements: list[str], pre_deduplicated: bool):
+    """Test that edges are deduplicated correctly, in one batched insert.
+    
+    Covers raw batches carrying duplicates and batches the caller already
+    deduplicated in Python.
+    """
     # Create edges
     edges = [
         Edge(
             src_uri="at://did:plc:123/app.bsky.feed.post/src",
             dst_uri="at://did:plc:456/app.bsky.feed.post/dst",
             edge_type="QUOTE",
-            created_at=datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            created_at=CREATED_AT,
         ),
         Edge(
             src_uri="at://did:plc:123/app.bsky.feed.post/src",
             dst_uri="at://did:plc:456/app.bsky.feed.post/dst",
             edge_type="QUOTE",
-            created_at=datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            created_at=CREATED_AT,
         ),  # Duplicate
         Edge(
             src_uri="at://did:plc:123/app.bsky.feed.post/src",
             dst_uri="at://did:plc:456/app.bsky.feed.post/dst",
             edge_type="REPLY",  # Different type
-            created_at=datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            created_at=CREATED_AT,
         ),
     ]
     
-    # Upsert edges
-    count = repo.upsert_edges(session, edges)
+    if pre_deduplicated:
+        edges = deduplicate_edges(edges)
+        assert len(edges) == 2
+    
+    # Upsert edges; only 2 are unique (duplicate ignored)
+    received, inserted = repo.upsert_edges(session, edges)
+    session.commit()
+    assert (received, inserted) == (len(edges), 2)
+    
+    # All rows go out as a single (executemany) INSERT, not one per edge
+    edge_inserts = [stmt for stmt in statements if stmt.startswith("INSERT INTO edges")]
+    assert len(edge_inserts) == 1
+    
+    # Re-submitting inserts nothing new
+    assert repo.upsert_edges(session, edges) == (len(edges), 0)
+
+
+def test_edge_insert_count_postgres(pg_session: Session):
+    """Test that the inserted edge count is exact across executemany pages."""
+    edges = [
+        Edge(src_uri=f"at://src/{i}", dst_uri="at://dst", edge_type="REPLY")
+        for i in range(12)
+    ]
+    
+    assert repo.upsert_edges(pg_session, edges[:3]) == (3, 3)
+    assert repo.upsert_edges(pg_session, edges) == (12, 9)
+    assert repo.upsert_edges(pg_session, edges) == (12, 0)
+
+
+def test_copy_keeps_empty_strings_postgres(pg_session: Session):
+    """Test that COPY-loaded batches keep '' and NULL apart, like small ones."""
+    posts = [
+        Post(
+            uri=f"at://did:plc:copy/app.bsky.feed.post/{i}",
+            cid=("" if i % 2 else None) if i < 4 else f"cid{i}",
+            author_did="did:plc:copy",
+            author_handle="copy.bsky.social",
+            created_at=CREATED_AT,
+            text="" if i == 0 else f'Post, "quoted" \\N\n{i}',
+        )
+        for i in range(repo.COPY_THRESHOLD)
+    ]
+    
+    assert repo.upsert_posts(pg_session, posts) == len(posts)
+    stored = {
+        post.uri: post
+        for post in pg_session.execute(ALL_POSTS).scalars()
+    }
+    for post in posts:
+        assert (stored[post.uri].cid, stored[post.uri].text) == (post.cid, post.text)
+
+
+def test_upsert_posts_chunked(session: Session):
+    """Test that batches spanning several insert pages are fully persisted."""
+    total = 2501
+    posts = [
+        Post(
+            uri=f"at://did:plc:bulk/app.bsky.feed.post/{i}",
+            author_did="did:plc:bulk",
+            author_handle="bulk.bsky.social",
+            created_at=CREATED_AT,
+            text=f"Bulk post {i}",
+        )
+        for i in range(total)
+    ]
+    
+    count = repo.upsert_posts(session, posts)
+    session.commit()
+    assert count == total
+    
+    assert session.execute(text("SELECT COUNT(*) FROM posts")).scalar() == total
+
+
+def test_run_node_degrees(session: Session):
+    """Test that degrees are aggregated only over edges within the node set."""
+    run_id = repo.create_run(
+        session,
+        mode="seed",
+        query=None,
+        seed_uri="at://a",
+        params_json={},
+    )
+    repo.link_run_posts(session, run_id, ["at://a", "at://b", "at://c"])
+    repo.link_run_edges(session, run_id, [
+        Edge(src_uri="at://b", dst_uri="at://a", edge_type="REPLY"),
+        Edge(src_uri="at://c", dst_uri="at://a", edge_type="QUOTE"),
+        Edge(src_uri="at://c", dst_uri="at://external", edge_type="QUOTE"),
+    ])
     session.commit()
-    assert count == 3
     
-    # Verify only 2 unique edges in database (duplicate ignored)
-    from app.db.models import Edge as DBEdge
-    from sqlalchemy import select, func
+    degrees = repo.get_run_node_degrees(session, run_id)
+    assert degrees == {
+        "at://a": (2, 0),
+        "at://b": (0, 1),
+        "at://c": (0, 1),
+    }
+    
+    # Restricting the node set drops edges to excluded nodes
+    degrees = repo.get_run_node_degrees(session, run_id, ["at://a", "at://b"])
+    assert degrees == {"at://a": (1, 0), "at://b": (0, 1)}
+    
+    # Edge lookups can be restricted to the same node set
+    assert len(repo.get_run_edges(session, run_id)) == 3
+    edges = repo.get_run_edges(session, run_id, ["at://a", "at://b"])
+    assert [tuple(edge)[:3] for edge in edges] == [("at://b", "at://a", "REPLY")]
+
+
+def test_iter_run_posts_and_edges(session: Session):
+    """Test streaming a run's posts and in-graph edges."""
+    posts = [
+        Post(
+            uri=f"at://did:plc:123/app.bsky.feed.post/{name}",
+            author_did="did:plc:123",
+            author_handle="user.bsky.social",
+            created_at=CREATED_AT,
+            text=name,
+        )
+        for name in ("a", "b")
+    ]
+    edges = [
+        Edge(src_uri=posts[1].uri, dst_uri=posts[0].uri, edge_type="REPLY"),
+        Edge(src_uri=posts[1].uri, dst_uri="at://external", edge_type="QUOTE"),
+    ]
+    repo.upsert_posts(session, posts)
+    run_id = repo.create_run(
+        session,
+        mode="seed",
+        query=None,
+        seed_uri=posts[0].uri,
+        params_json={},
+    )
+    repo.link_run_posts(session, run_id, [post.uri for post in posts])
+    repo.link_run_edges(session, run_id, edges)
+    session.commit()
+    
+    streamed = {post.uri for post in repo.iter_run_posts(session, run_id)}
+    assert streamed == {post.uri for post in posts}
+    
+    streamed_edges = [tuple(row) for row in repo.iter_run_node_edges(session, run_id)]
+    assert streamed_edges == [(posts[1].uri, posts[0].uri, "REPLY")]
+    
+    subset = list(repo.iter_run_posts(session, run_id, [posts[0].uri]))
+    assert [post.uri for post in subset] == [posts[0].uri]
+    assert list(repo.iter_run_node_edges(session, run_id, [posts[0].uri])) == []
+
+
+def test_persist_run(session: Session):
+    """Test that persist_run writes the run, posts, edges and links."""
+    posts = [
+        Post(
+            uri=f"at://did:plc:123/app.bsky.feed.post/{i}",
+            cid=f"cid{i}",
+            author_did="did:plc:123",
+            author_handle="user1.bsky.social",
+            created_at=CREATED_AT + timedelta(minutes=i),
+            text=f"Post {i}",
+            metrics=PostMetrics(like_count=i),
+        )
+        for i in range(3)
+    ]
+    edges = [
+        Edge(
+            src_uri=posts[1].uri,
+            dst_uri=posts[0].uri,
+            edge_type="REPLY",
+            created_at=posts[1].created_at,
+        ),
+        Edge(
+            src_uri=posts[2].uri,
+            dst_uri=posts[0].uri,
+            edge_type="QUOTE",
+            created_at=posts[2].created_at,
+        ),
+    ]
+    
+    run_id = repo.persist_run(
+        session,
+        mode="seed",
+        query=None,
+        seed_uri=posts[0].uri,
+        params_json={"maxDepth": 2},
+        posts=posts,
+        edges=edges,
+    )
+    session.commit()
+    
+    run = repo.get_run(session, run_id)
+    assert run.seed_uri == posts[0].uri
+    assert run.params_json == {"maxDepth": 2}
+    assert {post.uri for post in repo.get_run_posts(session, run_id)} == {
+        post.uri for post in posts
+    }
+    assert len(repo.get_run_edges(session, run_id)) == 2
+
+
+def test_persist_run_single_statement_postgres(pg_session: Session):
+    """Test persist_run's single-statement path on Postgres."""
+    posts = [
+        Post(
+            uri=f"at://did:plc:123/app.bsky.feed.post/{i}",
+            author_did="did:plc:123",
+            author_handle="user1.bsky.social",
+            created_at=CREATED_AT + timedelta(minutes=i),
+            text=f"Post {i}",
+        )
+        for i in range(3)
+    ]
+    # A repeated URI collapses to its last copy
+    duplicate = replace(posts[0], text="Post 0 again")
+    
+    # Query mode: no edges, so the edge arrays are empty
+    before = datetime.now(timezone.utc)
+    query_run_id = repo.persist_run(
+        pg_session,
+        mode="query",
+        query="test",
+        seed_uri=None,
+        params_json={"pages": 1},
+        posts=[*posts, duplicate],
+        edges=[],
+    )
+    
+    run = repo.get_run(pg_session, query_run_id)
+    assert (run.mode, run.query, run.seed_uri, run.params_json) == (
+        "query", "test", None, {"pages": 1},
+    )
+    assert before <= run.created_at <= datetime.now(timezone.utc)
+    links = pg_session.execute(
+        select(RunPost.uri, RunPost.created_at).where(RunPost.run_id == query_run_id)
+    ).all()
+    assert sorted(uri for uri, _ in links) == [post.uri for post in posts]
+    # Links share the run's timestamp, written by the same statement
+    assert {created_at for _, created_at in links} == {run.created_at}
+    stored = pg_session.get(DBPost, posts[0].uri)
+    assert stored.text == "Post 0 again"
+    assert repo.get_run_edges(pg_session, query_run_id) == []
+    
+    # Seed mode: edges without timestamps
+    edges = [
+        Edge(src_uri=posts[1].uri, dst_uri=posts[0].uri, edge_type="REPLY"),
+        Edge(src_uri=posts[2].uri, dst_uri=posts[0].uri, edge_type="QUOTE"),
+    ]
+    seed_run_id = repo.persist_run(
+        pg_session,
+        mode="seed",
+        query=None,
+        seed_uri=posts[0].uri,
+        params_json={},
+        posts=posts,
+        edges=edges,
+    )
+    
+    assert repo.get_run(pg_session, seed_run_id).seed_uri == posts[0].uri
+    assert sorted(tuple(edge) for edge in repo.get_run_edges(pg_session, seed_run_id)) == sorted(
+        (edge.src_uri, edge.dst_uri, edge.edge_type, None) for edge in edges
+    )
+    stored_edges = pg_session.execute(
+        select(DBEdge.created_at).where(DBEdge.dst_uri == posts[0].uri)
+    ).scalars().all()
+    assert stored_edges == [None, None]
+    assert sorted(pg_session.execute(
+        select(RunPost.uri).where(RunPost.run_id == seed_run_id)
+    ).scalars()) == [post.uri for post in posts]
+
+
+def test_create_run_ids_are_time_ordered(session: Session):
+    """Test that run IDs are UUIDv7 and sort by creation time."""
+    first = repo.create_run(session, mode="query", query="a", seed_uri=None, params_json={})
+    second = repo.create_run(session, mode="query", query="b", seed_uri=None, params_json={})
+    
+    assert first.version == 7
+    assert first.bytes[:6] <= second.bytes[:6]
+
+
+def test_upsert_posts_dedupes_batch(session: Session):
+    """Test that duplicate URIs within one batch collapse to the last one."""
+    posts = [
+        Post(
+            uri="at://did:plc:123/app.bsky.feed.post/abc",
+            cid=f"cid{i}",
+            author_did="did:plc:123",
+            author_handle="user1.bsky.social",
+            created_at=CREATED_AT,
+            text=f"Version {i}",
+            metrics=PostMetrics(like_count=i),
+        )
+        for i in range(3)
+    ]
+    
+    assert repo.upsert_posts(session, posts) == 3
+    session.commit()
+    
+    stored = session.execute(ALL_POSTS).scalar_one()
+    assert stored.text == "Version 2"
+    assert stored.like_count == 2
+
+
+def test_run_top_posts(session: Session):
+    """Test top-N selection and degrees computed in one query."""
+    posts = [
+        Post(
+            uri=f"at://{name}",
+            author_did="did:plc:123",
+            author_handle="user.bsky.social",
+            created_at=CREATED_AT,
+            metrics=PostMetrics(like_count=likes),
+        )
+        for name, likes in (("a", 10), ("b", 5), ("c", 5), ("d", 1))
+    ]
+    run_id = repo.create_run(session, mode="seed", query=None, seed_uri="at://a", params_json={})
+    repo.upsert_posts(session, posts)
+    repo.link_run_posts(session, run_id, [post.uri for post in posts])
+    repo.link_run_edges(session, run_id, [
+        Edge(src_uri="at://b", dst_uri="at://a", edge_type="REPLY"),
+        Edge(src_uri="at://d", dst_uri="at://a", edge_type="REPLY"),
+        Edge(src_uri="at://c", dst_uri="at://b", edge_type="QUOTE"),
+    ])
+    session.commit()
+    
+    top = repo.get_run_top_posts(session, run_id, 3)
+    # Ties on score are broken by URI
+    assert [(row.uri, row.in_degree, row.out_degree) for row in top] == [
+        ("at://a", 1, 0),
+        ("at://b", 1, 1),
+        ("at://c", 0, 1),
+    ]
+    assert top[0].like_count == 10
     
-    stmt = select(func.count()).select_from(DBEdge)
-    result = session.execute(stmt)
-    total_edges = result.scalar()
-    assert total_edges == 2
+    assert len(repo.get_run_top_posts(session, run_id, 10)) == 4